@@ -1,40 +1,60 @@
+import argparse
+import time
 import tkinter.messagebox
+from concurrent.futures import Future
 
 import boggle_board_randomizer as randomizer
 import boggle_gui as gui
-import ex12_utils as utils
+import boggle_lexicon as lexicons
+import boggle_profile as profile
+import boggle_session as session
 
-INITIAL_TIME = 180  # initial time in seconds
-HINT_ATTEMPTS = 3
+DICT_PATH = "boggle_dict.txt"  # compile it with `python boggle_lexicon.py compile-dict` for a faster start
+LOADING_POLL_TIME = 10  # ms between checks of the background loading
+PROGRESS_DELAY = 200  # ms of loading before its progress is shown, a restart is usually ready long before
+LOADING_MESSAGE_TIME = 60000
+HINT_POLL_TIME = 10  # ms between checks of a hint searched in the background
 
 
 class GameEngine:
-    def __init__(self, board, words_list):
+    def __init__(self, board, lexicon, timing=False, hint_mode=session.SHORTEST, dict_path=DICT_PATH):
         """
         Initialize Boggle game
         :param board: board list
-        :param words_list: words dictionary
+        :param lexicon: words lexicon, shared by every solver call, or a future of it while it's loading
+        :param timing: if True, print how long the game took to be ready
+        :param hint_mode: session.SHORTEST or session.BEST, the word given by hints
+        :param dict_path: the words file, or its compiled dictionary, loaded again on restart if it changed
         """
+        self.__hint_mode = hint_mode
+        self.__dict_path = dict_path
+        self.__start_time = time.perf_counter()
+        self.__timing = timing
         self.__board = board
         self.__gui = gui.BoggleGUI(self.__board)
         self.__countdown_func = None
-        self.reset(board, words_list)
+        self.__loading_func = None
+        self.__session = None
+        self.__lexicon = None
+        self.__hint_future = None
+        self.__hint_func = None
+        self.reset(board, lexicon)
 
-    def reset(self, board, words_list):
+    def reset(self, board, lexicon):
         """
         Reset the game completely, this is seperated from __init__ due to the restart game functionality
         :param board:
-        :param words_list:
+        :param lexicon: words lexicon, or a future of it while it's loading
         :return:
         """
+        # drop the background work of the previous board, so that its results never show up on the new one
+        self.__cancel_background()
         self.__board = board
-        self.__words = words_list
-        self.__score = 0
-        self.__hint_attempts = HINT_ATTEMPTS
-        self.__gui.update_hint(self.__hint_attempts)
-        self.__game_lost = False
-        self.__current_word = ''
-        self.__current_path = []
+        self.__lexicon = lexicon
+        # the game rules live in a session, the engine only connects it to the GUI. It is created once the
+        # lexicon is loaded, until then the letter buttons are disabled
+        self.__session = None
+        self.__gui.update_hint(session.HINT_ATTEMPTS)
         self.__gui.create_letters_buttons(True)
         for button in self.__gui.get_buttons():
             func = self.add_button_functionality(button, 'letter')
@@ -43,12 +63,81 @@ class GameEngine:
         # if we call the reset function and there's a countdown going on, terminate it and start a new one.
         if self.__countdown_func:
             self.__gui.root.after_cancel(self.__countdown_func)
+        if self.__loading_func:
+            self.__gui.root.after_cancel(self.__loading_func)
 
-        self.__time = INITIAL_TIME
         # change text in GUI time label
-        mins, secs = divmod(self.__time, 60)
+        mins, secs = divmod(session.INITIAL_TIME, 60)
         timer = '{:02d}:{:02d}'.format(mins, secs)
         self.__gui.update_timer(timer)
+        self.__wait_until_ready(lexicon)
+
+    def __cancel_background(self):
+        """
+        Cancel the loading, solving and hint searches of the current board which didn't start yet, and stop polling
+        the ones already running, their results are dropped
+        """
+        if self.__hint_func:
+            self.__gui.root.after_cancel(self.__hint_func)
+            self.__hint_func = None
+        for future in (self.__hint_future, self.__lexicon):
+            if isinstance(future, Future):
+                future.cancel()
+        self.__hint_future = None
+        if self.__session is not None:
+            self.__session.cancel()
+
+    @property
+    def is_ready(self):
+        """
+        :return: True once the lexicon is loaded and the board solved
+        """
+        return self.__session is not None and self.__session.solution_index.done()
+
+    def __wait_until_ready(self, lexicon, polls=0):
+        """
+        Poll the background loading of the lexicon, then the solving of the board, showing the progress in the user
+        message area
+        :param lexicon: the lexicon, or its future
+        :param polls: number of times the loading was polled
+        :return: None
+        """
+        self.__loading_func = None
+        if self.__session is None and (not isinstance(lexicon, Future) or lexicon.done()):
+            try:
+                loaded = lexicon.result() if isinstance(lexicon, Future) else lexicon
+            except (OSError, ValueError) as error:
+                tkinter.messagebox.showerror('Boggle', 'Could not load the dictionary:\n' + str(error))
+                self.__gui.root.destroy()
+                return
+            self.__session = session.GameSession(self.__board, loaded, hint_mode=self.__hint_mode)
+
+        waited = polls * LOADING_POLL_TIME
+        if self.is_ready:
+            self.__gui.update_score(self.__score_text())
+            if waited - LOADING_POLL_TIME >= PROGRESS_DELAY:
+                # the progress was shown
+                self.__gui.add_user_message('READY!', 1500)
+            if self.__timing:
+                self.__print_timing()
+            return
+
+        if waited >= PROGRESS_DELAY:
+            stage = 'LOADING WORDS' if self.__session is None else 'SOLVING BOARD'
+            self.__gui.add_user_message(stage + '\n' + '.' * (waited // 200 % 4 + 1), LOADING_MESSAGE_TIME, 12)
+        self.__loading_func = self.__gui.root.after(LOADING_POLL_TIME, self.__wait_until_ready, lexicon, polls + 1)
+
+    def __score_text(self):
+        # the score out of the highest score possible on the board
+        return 'SCORE: %d / %d' % (self.__session.score, self.__session.max_score)
+
+    def __print_timing(self):
+        ready_time = time.perf_counter() - self.__start_time
+        first_frame = self.__gui.startup_time
+        print('ready after %.0f ms, first frame after %s ms (%d images loaded in %.0f ms)'
+              % (ready_time * 1000, '-' if first_frame is None else '%.0f' % (first_frame * 1000),
+                 len(self.__gui._assets), self.__gui._assets.load_time * 1000))
+        self.__timing = False
 
     def create_help_buttons(self):
         self.__hint_btn = self.__gui._make_hint_button()
@@ -56,21 +145,6 @@ class GameEngine:
         self.__restart_btn = self.__gui._make_restart_button()
         self.__gui.set_button_action(self.__restart_btn, self.add_button_functionality(self.__restart_btn, 'restart'))
 
-    def check_if_neighbor(self, current_coordinate):
-        """
-        Check if a given coordinate is a neighbor of the last coordinate in our current path
-        :param current_coordinate: given coordinate
-        :return: True if neighbor, False otherwise
-        """
-        if len(self.__current_path) == 0:
-            return True
-        last_path_coordinate = self.__current_path[-1]
-        if last_path_coordinate != current_coordinate and not (
-                abs(last_path_coordinate[0] - current_coordinate[0]) > 1 or
-                abs((last_path_coordinate[1] - current_coordinate[1])) > 1):
-            return True
-        return False
-
     def add_button_functionality(self, button, type):
         """
         Add GUI buttons functionality based on their type
@@ -79,92 +153,72 @@ class GameEngine:
         :return: the given button's function that'll fire when button's clicked
         """
         if type == 'letter':
+            @profile.timed('letter_func')
             def letter_func():
                 """
                 Function to return when a letter button is clicked
                 """
-                if self.__time == INITIAL_TIME:
+                if not self.is_ready:
+                    # the progress of the loading is already shown
+                    return
+                if not self.__session.started:
                     # If this is the first button press, uncover the letters, start countdown and create help buttons
+                    self.__session.start()
                     self.__gui.show_letters_content()
                     self.create_help_buttons()
                     self.countdown()
                     return
-                if not self.__game_lost:
-                    position = self.__gui.button_coordinate(button)
-                    letter = button['text']
-                    if position not in self.__current_path:
-                        if self.check_if_neighbor(position):
-                            # If the clicked button is a neighbor of the last button in the path, add its content
-                            # to the bottom indicator, add its coordinates to the path, and color it.
-                            self.__current_word += letter
-                            self.__current_path.append(position)
-                            self.__gui.simulate_button_press(button,
-                                                             self.__current_word)
-                            # check if current words is valid, if so, add score and add the word to the guessed words
-                            # list, in addition, display a message indicating the score added and play a nice animation.
-                            word = utils.is_valid_path(self.__board,
-                                                       self.__current_path,
-                                                       self.__words)
-                            if word and self.__words[word]:
-                                added_score = self.__add_score()
-                                for coord in self.__current_path:
-                                    btn = self.__gui.get_button_from_coordinate(coord)
-                                    self.__gui.run_animation('success', btn, 150)
-                                self.__gui.add_user_message('Nice! +' + str(added_score), 2000)
-                                self.__words[word] = False
-                                self.__current_path = []
-                                self.__gui.add_guessed_word(
-                                    self.__current_word)
-                                self.__gui.change_word_text('')
-                                self.__current_word = ''
-                                self.__gui.reset_board()
-                        else:
-                            # if button is not a neighbor, show a warning message and an animation showing which letters
-                            # can be selected
-                            buttons = self.__gui.get_buttons()
-                            for btn in buttons:
-                                if self.check_if_neighbor(buttons[btn][1]) and not buttons[btn][2]:
-                                    self.__gui.run_animation('warning', btn, 150)
-                                    self.__gui.add_user_message('ONLY NEARBY LETTERS\nCAN BE SELECTED', 3000, 9,
-                                                                '#d64d3c')
-
-                    else:
-                        # if clicked button is already in our path, check if it can be deselected (if it's the last one
-                        # in our path), if so, deselect it. Otherwise, show an appropriate message and animation.
-                        last_path_button = self.__gui.get_button_from_coordinate(self.__current_path[-1])
-                        if last_path_button == button:
-                            self.__current_word = self.__current_word[
-                                                  :-len(letter)]
-                            self.__gui.simulate_button_press(button,
-                                                             self.__current_word)
-                            self.__current_path.pop()
-                        else:
-                            last_button_in_path = self.__gui.get_button_from_coordinate(self.__current_path[-1])
-                            self.__gui.run_animation('warning', last_button_in_path, 75)
-                            self.__gui.add_user_message('ONLY LAST LETTER\nCAN BE REMOVED', 3000, 9, '#d64d3c')
+                move = self.__session.select(self.__gui.button_coordinate(button))
+                if move.result == session.SELECTED or move.result == session.DESELECTED:
+                    # If the clicked button is a neighbor of the last button in the path, its content was added to
+                    # the bottom indicator and its coordinates to the path, color it (or uncolor it if it was removed).
+                    # The word is shown in red while no word starts with it.
+                    self.__gui.simulate_button_press(button, move.word, self.__session.dead_end)
+                elif move.result == session.WORD_FOUND:
+                    # the current word is valid, add score and add the word to the guessed words list, in addition,
+                    # display a message indicating the score added and play a nice animation.
+                    self.__gui.simulate_button_press(button, move.word)
+                    self.__gui.update_score(self.__score_text())
+                    for coord in move.path:
+                        btn = self.__gui.get_button_from_coordinate(coord)
+                        self.__gui.run_animation('success', btn, 150)
+                    self.__gui.add_user_message('Nice! +' + str(move.score), 2000)
+                    self.__gui.add_guessed_word(move.word, move.score)
+                    self.__gui.change_word_text('')
+                    self.__gui.reset_board()
+                elif move.result == session.NOT_NEIGHBOR:
+                    # if button is not a neighbor, show a warning message and an animation showing which letters
+                    # can be selected
+                    buttons = self.__gui.get_buttons()
+                    for btn in buttons:
+                        if self.__session.check_if_neighbor(buttons[btn][1]) and not buttons[btn][2]:
+                            self.__gui.run_animation('warning', btn, 150)
+                            self.__gui.add_user_message('ONLY NEARBY LETTERS\nCAN BE SELECTED', 3000, 9,
+                                                        '#d64d3c')
+                elif move.result == session.NOT_LAST:
+                    # if clicked button is already in our path but isn't the last one in it, it can't be deselected,
+                    # show an appropriate message and animation.
+                    last_button_in_path = self.__gui.get_button_from_coordinate(move.path[-1])
+                    self.__gui.run_animation('warning', last_button_in_path, 75)
+                    self.__gui.add_user_message('ONLY LAST LETTER\nCAN BE REMOVED', 3000, 9, '#d64d3c')
 
             return letter_func
 
         elif type == 'hint':
+            @profile.timed('hint_func')
             def hint_func():
                 """
                 Function to return when a hint button is clicked
                 """
-                if self.__hint_attempts == 0:
-                    self.__gui.add_user_message('NO REVEALS LEFT!', 4000, 12, '#d64d3c')
+                if self.__hint_future is not None:
+                    # the previous hint is still being searched
+                    return
+                if self.__session.hint_attempts == 0:
+                    self.show_hint(self.__session.hint())
                     return
-                hint_coordinates = self.__find_reveal()
-                btn_list = []
-                if not hint_coordinates:
-                    # if there's no hint matching the current path, show the appropriate message.
-                    self.__gui.add_user_message('NO WORDS\nMATCH THE PATH!', 4000, 10, '#d64d3c')
-                else:
-                    # If a hint is found, animate the letters of the word and remove one hint attempt.
-                    self.__hint_attempts -= 1
-                    self.__gui.update_hint(self.__hint_attempts)
-                    for coord in hint_coordinates:
-                        btn_list.append(self.__gui.get_button_from_coordinate(coord))
-                    self.__gui.run_animation('hint', btn_list, 200)
+                # an unsolved board is searched on the hint thread, the countdown and the animations keep running meanwhile
+                self.__hint_future = self.__session.hint_in_background()
+                self.__wait_for_hint()
 
             return hint_func
         elif type == 'restart':
@@ -174,36 +228,38 @@ class GameEngine:
 
             return restart_func
 
-    def __find_reveal(self):
+    def __wait_for_hint(self):
         """
-        A function that uses find_length_n_path from ex12_utils to find hints matching our path
-        :return:
+        Poll the search of the hint from the Tk main loop, and show the hint once it's found
+        :return: None
         """
-        for n in range(len(self.__current_path) + 1, len(self.__board) ** 2 + 1):
-            # search for paths larger than the current path
-            paths = utils.find_length_n_paths(n, self.__board, list(self.__words.keys()))
-            for path in paths:
-                # if n = length of our path, then if the found path matches our path in the first n steps, and in
-                # addition the word wasn't already found, then the path is valid hint and we shall return it.
-                if self.__current_path == path[:len(self.__current_path)] and self.__words[self.__path_to_word(path)]:
-                    return path
-
-    def __path_to_word(self, path):
-        # convert a path to a word
-        word = ''
-        for coordinate in path:
-            word += self.__board[coordinate[0]][coordinate[1]]
-        return word
+        self.__hint_func = None
+        if not self.__hint_future.done():
+            self.__hint_func = self.__gui.root.after(HINT_POLL_TIME, self.__wait_for_hint)
+            return
+        future, self.__hint_future = self.__hint_future, None
+        if not self.__session.is_over:
+            self.show_hint(self.__session.use_hint(future))
 
-    def __add_score(self):
+    def show_hint(self, move):
         """
-        Adds score, the score is the path length to the power of 2.
-        :return: added score
+        Show the result of a hint
+        :param move: the hint Move of the session
+        :return: None
         """
-        added_score = len(self.__current_path) ** 2
-        self.__score += added_score
-        self.__gui.update_score('SCORE: ' + str(self.__score))
-        return added_score
+        if move.result == session.NO_HINTS_LEFT:
+            self.__gui.add_user_message('NO REVEALS LEFT!', 4000, 12, '#d64d3c')
+        elif move.result == session.HINT_PENDING:
+            # the board is still being solved, the hint attempt wasn't used
+            self.__gui.add_user_message('STILL THINKING,\nTRY AGAIN!', 2000, 10, '#d64d3c')
+        elif move.result == session.NO_MATCH:
+            # if there's no hint matching the current path, show the appropriate message.
+            self.__gui.add_user_message('NO WORDS\nMATCH THE PATH!', 4000, 10, '#d64d3c')
+        elif move.result == session.HINT:
+            # If a hint is found, animate the letters of the word, one hint attempt was used.
+            self.__gui.update_hint(self.__session.hint_attempts)
+            btn_list = [self.__gui.get_button_from_coordinate(coord) for coord in move.path]
+            self.__gui.run_animation('hint', btn_list, 200)
 
     def countdown(self):
         """
@@ -211,19 +267,19 @@ class GameEngine:
         :return:
         """
         # change text in GUI label
-        mins, secs = divmod(self.__time, 60)
+        mins, secs = divmod(self.__session.time_left, 60)
         timer = '{:02d}:{:02d}'.format(mins, secs)
         self.__gui.update_timer(timer)
 
-        if self.__time > 0:
+        if self.__session.time_left > 0:
             # call countdown again after 1000ms (1s)
-            self.__time = self.__time - 1
+            self.__session.tick()
             self.__countdown_func = self.__gui.root.after(1000, self.countdown)
         else:
             # if time's up, reset the board and run the game_over function.
             self.__gui.reset_board()
             self.__hint_btn.destroy()
-            self.__gui.game_over(str(self.__score))
+            self.__gui.game_over(str(self.__session.score))
             self.__gui.add_user_message('YOU MAY RESTART BY\n USING THE BUTTON ABOVE', 60000, 8)
 
     def restart_game(self):
@@ -231,20 +287,28 @@ class GameEngine:
         Restart the GUI and the game engine.
         :return:
         """
-        board = randomizer.randomize_board()
+        # keep the size of the current board
+        board = randomizer.randomize_board(randomizer.DICE_SETS[len(self.__board)])
         self.__gui.reset(board)
-        words_list = utils.load_words_from_file("boggle_dict.txt")
+        # the lexicon of the previous game is reused at once, unless the dictionary file changed
+        lexicon = lexicons.cached_lexicon(self.__dict_path)
+        if lexicon is None:
+            lexicon = session.load_in_background(self.__dict_path)
 
-        self.reset(board, words_list)
+        self.reset(board, lexicon)
 
     @staticmethod
-    def new_game():
+    def new_game(size=randomizer.BOARD_SIZE, timing=False, hint_mode=session.SHORTEST, dict_path=DICT_PATH):
         """
-        Creates a new random game
+        Creates a new random game. The window shows up at once, the dictionary is loaded in the background.
+        :param size: the board is size x size, one of randomizer.DICE_SETS
+        :param timing: if True, print how long the game took to be ready
+        :param hint_mode: session.SHORTEST or session.BEST, the word given by hints
+        :param dict_path: the words file, or its compiled dictionary
         """
-        board = randomizer.randomize_board()
-        words_list = utils.load_words_from_file("boggle_dict.txt")
-        controller = GameEngine(board, words_list)
+        board = randomizer.randomize_board(randomizer.DICE_SETS[size])
+        lexicon = session.load_in_background(dict_path)
+        controller = GameEngine(board, lexicon, timing, hint_mode, dict_path)
         controller.start_game()
 
     def start_game(self):
@@ -252,4 +316,18 @@ class GameEngine:
 
 
 if __name__ == '__main__':
-    GameEngine.new_game()
+    parser = argparse.ArgumentParser(description='Boggle game')
+    parser.add_argument('--size', type=int, choices=sorted(randomizer.DICE_SETS),
+                        default=randomizer.BOARD_SIZE,
+                        help='board size: 4 (Boggle), 5 (Big Boggle) or 6 (Super Big Boggle)')
+    parser.add_argument('--timing', action='store_true', help='print the startup times')
+    parser.add_argument('--profile', action='store_true',
+                        help='time the hot paths, the stats are printed on exit (or set ' + profile.ENV_VAR + ')')
+    parser.add_argument('--hints', choices=session.HINT_MODES, default=session.SHORTEST,
+                        help='reveal the shortest word or the one with the highest score')
+    parser.add_argument('--dict', default=DICT_PATH, metavar='PATH',
+                        help='the words file, one word per line, or its compiled dictionary (default: %(default)s)')
+    args = parser.parse_args()
+    if args.profile:
+        profile.enable()
+    GameEngine.new_game(args.size, args.timing, args.hints, args.dict)
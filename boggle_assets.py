@@ -0,0 +1,178 @@
+"""
+Images of the GUI: loaded when first needed and cached, optionally from a
+precomputed asset pack.
+
+    python boggle_assets.py build [PACK]    build the asset pack
+
+The pack holds the PNG files of images/ in a single memory-mapped file, so
+that the images are read without opening a file each. The letter button
+images are scaled for the larger boards by Tk's zoom and subsample, as when
+they're read from their files. An image whose file changed since the pack
+was built is read from its file instead.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+import tkinter as tki
+
+import boggle_lexicon as lexicons
+
+IMAGES_DIR = 'images'
+PACK_PATH = os.path.join(IMAGES_DIR, 'assets.pack')
+# pack file layout: a header, a JSON index of its length, then the images
+PACK_MAGIC = b'BOGPACK1'
+PACK_HEADER = struct.Struct('<8sI')  # magic, index length
+
+# the layout is designed for a 4x4 board, letter buttons images are scaled
+# down by BASE_BOARD_SIZE / size for larger boards
+BASE_BOARD_SIZE = 4
+LETTER_BUTTON_IMAGES = ('button_bg2', 'alert_button', 'success_button',
+                        'hint_letter_button', 'button_clicked',
+                        'selected_button')
+
+
+def image_path(name):
+    return os.path.join(IMAGES_DIR, name + '.png')
+
+
+def _image_key(name, board_size):
+    """
+    :return: key of an image for a board size in the cache and in the pack
+    """
+    if board_size == BASE_BOARD_SIZE:
+        return name
+    return '%s@%d' % (name, board_size)
+
+
+class AssetPack:
+    """
+    A memory-mapped asset pack
+    """
+
+    def __init__(self, file_path):
+        with open(file_path, 'rb') as pack_file:
+            self.__buffer = mmap.mmap(pack_file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+        magic, index_length = PACK_HEADER.unpack_from(self.__buffer)
+        if magic != PACK_MAGIC:
+            raise ValueError('%s is not an asset pack' % file_path)
+        index = json.loads(self.__buffer[PACK_HEADER.size:
+                                         PACK_HEADER.size + index_length])
+        self.__sources = index['sources']
+        self.__images = index['images']
+        self.__data_start = PACK_HEADER.size + index_length
+
+    def data(self, name):
+        """
+        :return: PNG data of an image, None if it isn't in the pack or its
+        file changed since the pack was built
+        """
+        entry = self.__images.get(name)
+        source = self.__sources.get(name)
+        if entry is None or source is None or \
+                lexicons._file_signature(image_path(name)) != tuple(source):
+            return None
+        offset, length = entry
+        start = self.__data_start + offset
+        return self.__buffer[start:start + length]
+
+
+class AssetCache:
+    """
+    The images of a Tk root, each loaded the first time it is needed and
+    kept for the lifetime of the root, across game resets. Images are read
+    from the asset pack when it has them, otherwise from their PNG file.
+    """
+
+    def __init__(self, master, pack_path=PACK_PATH):
+        """
+        :param master: Tk root owning the images
+        :param pack_path: asset pack, ignored if it doesn't exist
+        """
+        self.__master = master
+        self.__images = dict()
+        self.__pack = AssetPack(pack_path) if os.path.exists(pack_path) \
+            else None
+        self.load_time = 0.0  # seconds spent loading images
+
+    def image(self, name, board_size=BASE_BOARD_SIZE):
+        """
+        :param name: image file name, without its directory and extension
+        :param board_size: size of the board the image is scaled to
+        :return: the PhotoImage
+        """
+        key = _image_key(name, board_size)
+        image = self.__images.get(key)
+        if image is None:
+            start = time.perf_counter()
+            image = self.__load(name, board_size)
+            self.load_time += time.perf_counter() - start
+            self.__images[key] = image
+        return image
+
+    def __load(self, name, board_size):
+        image = None
+        data = self.__pack.data(name) if self.__pack else None
+        if data is not None:
+            try:
+                image = tki.PhotoImage(master=self.__master, data=data,
+                                       format='png')
+            except tki.TclError:
+                # a Tk without binary PNG data support, read the file
+                pass
+        if image is None:
+            image = tki.PhotoImage(master=self.__master,
+                                   file=image_path(name))
+        if board_size != BASE_BOARD_SIZE:
+            image = image.zoom(BASE_BOARD_SIZE).subsample(board_size)
+        return image
+
+    def __len__(self):
+        return len(self.__images)
+
+
+def build_pack(pack_path=PACK_PATH):
+    """
+    Build the asset pack of the images of IMAGES_DIR
+    :return: number of images in the pack
+    """
+    sources, images, blobs = dict(), dict(), []
+    offset = 0
+    for file_name in sorted(os.listdir(IMAGES_DIR)):
+        name, extension = os.path.splitext(file_name)
+        if extension != '.png':
+            continue
+        with open(image_path(name), 'rb') as image_file:
+            data = image_file.read()
+        sources[name] = lexicons._file_signature(image_path(name))
+        images[name] = [offset, len(data)]
+        blobs.append(data)
+        offset += len(data)
+
+    index = json.dumps({'sources': sources, 'images': images}).encode()
+    with open(pack_path, 'wb') as pack_file:
+        pack_file.write(PACK_HEADER.pack(PACK_MAGIC, len(index)))
+        pack_file.write(index)
+        for blob in blobs:
+            pack_file.write(blob)
+    return len(images)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Boggle GUI assets')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help='build the asset pack')
+    build_parser.add_argument('pack', nargs='?', default=PACK_PATH,
+                              help='pack file (default: %s)' % PACK_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build_pack(args.pack)
+        print('packed %d images into %s' % (count, args.pack))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Batch scoring of many boards at once with NumPy, for rating boards offline.
+Boards are given as arrays of letter codes (see
+boggle_board_randomizer.TILES), and the lexicon is walked with arrays of
+frontier paths covering every board and every cell together.
+"""
+import numpy as np
+
+import boggle_board_randomizer as randomizer
+
+NO_NODE = -1
+MAX_DIRECTIONS = 8
+
+
+class BatchLexicon:
+    """
+    A lexicon as transition arrays over the letter codes of the tiles.
+    Nodes are numbered from 0 (the root). For a node and a letter code:
+    next_node holds the node reached, NO_NODE if there's none, and
+    word_offset the number of words which are alphabetically smaller than
+    every word going through that transition; summing the offsets along a
+    path gives the rank of the word it ends on, a unique id used to count
+    distinct words.
+    """
+
+    def __init__(self, lexicon):
+        """
+        :param lexicon: a lexicon from boggle_lexicon
+        """
+        self.__lexicon = lexicon
+        self.__words_below = dict()
+        self.words_count = self.__count_words_below(lexicon.root)
+
+        ids = {lexicon.node_id(lexicon.root): 0}
+        nodes = [lexicon.root]
+        transitions = []
+        i = 0
+        while i < len(nodes):
+            node_transitions = []
+            for code, tile in enumerate(randomizer.TILES):
+                child, offset = self.__walk_tile(nodes[i], tile)
+                if child is None:
+                    continue
+                child_id = lexicon.node_id(child)
+                if child_id not in ids:
+                    ids[child_id] = len(nodes)
+                    nodes.append(child)
+                node_transitions.append((code, ids[child_id], offset))
+            transitions.append(node_transitions)
+            i += 1
+        del self.__words_below
+
+        tiles_count = len(randomizer.TILES)
+        self.next_node = np.full((len(nodes), tiles_count), NO_NODE,
+                                 dtype=np.int32)
+        self.word_offset = np.zeros((len(nodes), tiles_count), dtype=np.int32)
+        for node, node_transitions in enumerate(transitions):
+            for code, child, offset in node_transitions:
+                self.next_node[node, code] = child
+                self.word_offset[node, code] = offset
+        self.is_word = np.array([lexicon.is_word(node) for node in nodes],
+                                dtype=bool)
+
+    def __count_words_below(self, node):
+        """
+        :return: number of words in the lexicon below node (node included)
+        """
+        node_id = self.__lexicon.node_id(node)
+        if node_id not in self.__words_below:
+            count = int(self.__lexicon.is_word(node))
+            for char, child in self.__lexicon.edges(node):
+                count += self.__count_words_below(child)
+            self.__words_below[node_id] = count
+        return self.__words_below[node_id]
+
+    def __walk_tile(self, node, tile):
+        """
+        Follow the chars of a tile, counting the words skipped on the way.
+        The offset only depends on the chars, so a word gets the same rank
+        whichever tiles spell it (QU or Q then U).
+        :return: (node reached, words offset), (None, 0) if there's no node
+        """
+        offset = 0
+        for char in tile:
+            if self.__lexicon.is_word(node):
+                offset += 1
+            for edge_char, child in self.__lexicon.edges(node):
+                if edge_char == char:
+                    node = child
+                    break
+                offset += self.__count_words_below(child)
+            else:
+                return None, 0
+        return node, offset
+
+
+def encode_boards(boards):
+    """
+    :param boards: list of boards, each a 2 dimensional list of tiles
+    :return: (N, size, size) array of letter codes
+    """
+    return np.array([randomizer.encode_board(board) for board in boards],
+                    dtype=np.uint8)
+
+
+def __neighbor_array(size):
+    """
+    :return: (size * size, MAX_DIRECTIONS) array of the neighbor cell indices
+    of each cell index, padded with -1
+    """
+    neighbors = np.full((size * size, MAX_DIRECTIONS), -1, dtype=np.int64)
+    for row in range(size):
+        for col in range(size):
+            k = 0
+            for i in range(max(row - 1, 0), min(row + 2, size)):
+                for j in range(max(col - 1, 0), min(col + 2, size)):
+                    if (i, j) != (row, col):
+                        neighbors[row * size + col, k] = i * size + j
+                        k += 1
+    return neighbors
+
+
+def score_boards(boards, batch_lexicon, chunk_size=1024):
+    """
+    Count the words of many boards and their max achievable score, the sum
+    of len(path) ** 2 over the longest path of each word on the board (the
+    score of max_score_paths in ex12_utils).
+    :param boards: (N, size, size) array of letter codes
+    :param batch_lexicon: a BatchLexicon
+    :param chunk_size: number of boards walked together, bounds the memory
+    :return: (word counts, max scores), two int64 arrays of length N
+    """
+    boards = np.asarray(boards)
+    board_count, size = boards.shape[0], boards.shape[1]
+    if size * size > 63:
+        raise ValueError('boards larger than 7x7 are not supported')
+    word_counts = np.zeros(board_count, dtype=np.int64)
+    max_scores = np.zeros(board_count, dtype=np.int64)
+    neighbors = __neighbor_array(size)
+    for start in range(0, board_count, chunk_size):
+        cells = boards[start:start + chunk_size].reshape(-1, size * size)
+        counts, scores = __score_chunk(cells.astype(np.int64), neighbors,
+                                       batch_lexicon)
+        word_counts[start:start + len(cells)] = counts
+        max_scores[start:start + len(cells)] = scores
+    return word_counts, max_scores
+
+
+def __score_chunk(cells, neighbors, batch_lexicon):
+    """
+    :param cells: (N, size * size) array of letter codes
+    :param neighbors: neighbor array of the board size
+    :param batch_lexicon: a BatchLexicon
+    :return: (word counts, max scores) of the N boards
+    """
+    board_count, cells_count = cells.shape
+    next_node, word_offset = batch_lexicon.next_node, batch_lexicon.word_offset
+
+    # the frontier holds one entry per path still leading to words:
+    # its board, last cell, lexicon node, visited cells bitmask and word rank
+    board = np.repeat(np.arange(board_count), cells_count)
+    cell = np.tile(np.arange(cells_count), board_count)
+    code = cells[board, cell]
+    node = next_node[0, code]
+    rank = word_offset[0, code].astype(np.int64)
+    visited = np.left_shift(np.int64(1), cell)
+    alive = node != NO_NODE
+    board, cell, node, rank, visited = \
+        board[alive], cell[alive], node[alive], rank[alive], visited[alive]
+
+    found_boards, found_ranks, found_lengths = [], [], []
+    length = 1
+    while len(board):
+        words = batch_lexicon.is_word[node]
+        found_boards.append(board[words])
+        found_ranks.append(rank[words])
+        found_lengths.append(np.full(np.count_nonzero(words), length))
+
+        # extend every path in each of the 8 directions, keeping the steps
+        # landing on a free cell whose letter continues a word
+        next_cell = neighbors[cell].ravel()
+        parent = np.repeat(np.arange(len(board)), MAX_DIRECTIONS)
+        free = next_cell >= 0
+        free[free] = (visited[parent[free]] >>
+                      next_cell[free] & 1) == 0
+        parent, next_cell = parent[free], next_cell[free]
+        code = cells[board[parent], next_cell]
+        child = next_node[node[parent], code]
+        alive = child != NO_NODE
+        parent, next_cell, code, child = \
+            parent[alive], next_cell[alive], code[alive], child[alive]
+
+        rank = rank[parent] + word_offset[node[parent], code]
+        visited = visited[parent] | np.left_shift(np.int64(1), next_cell)
+        board, cell, node = board[parent], next_cell, child
+        length += 1
+
+    if not found_boards:
+        return np.zeros(board_count, np.int64), np.zeros(board_count, np.int64)
+    found_boards = np.concatenate(found_boards)
+    found_ranks = np.concatenate(found_ranks)
+    found_lengths = np.concatenate(found_lengths)
+
+    # keep the longest path of each (board, word)
+    keys = found_boards * batch_lexicon.words_count + found_ranks
+    order = np.lexsort((found_lengths, keys))
+    keys, found_boards, found_lengths = \
+        keys[order], found_boards[order], found_lengths[order]
+    last = np.ones(len(keys), dtype=bool)
+    last[:-1] = keys[1:] != keys[:-1]
+    found_boards, found_lengths = found_boards[last], found_lengths[last]
+
+    word_counts = np.bincount(found_boards, minlength=board_count)
+    max_scores = np.bincount(found_boards, weights=found_lengths ** 2,
+                             minlength=board_count)
+    return word_counts.astype(np.int64), max_scores.astype(np.int64)
@@ -0,0 +1,249 @@
+"""
+Benchmarks of the solver entry points of ex12_utils and of the dictionary
+loading, on a fixed corpus of boards.
+
+    python boggle_benchmark.py                      run and print the results
+    python boggle_benchmark.py --save FILE          also store them as a baseline
+    python boggle_benchmark.py --check FILE         fail if slower than a baseline
+                                                    or than the latency targets
+
+Timings depend on the machine, so a baseline should be saved on the machine
+it is checked on.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import boggle_board_randomizer as randomizer
+import boggle_lexicon
+import ex12_utils as utils
+
+DICT_PATH = 'boggle_dict.txt'
+BASELINE_PATH = 'benchmark_baseline.json'
+CORPUS_SEED = 12
+RANDOM_BOARDS = 24
+LENGTHS = range(3, 9)
+PERCENTILES = (50, 90, 99)
+REPEATS = 3  # each call is timed this many times, keeping the fastest run
+DEFAULT_TOLERANCE = 1.5  # a result may be up to 50% worse than the baseline
+MIN_REGRESSION_MS = 0.05  # below this, a slowdown is treated as noise
+SIZED_BOARDS = 12  # random boards of each size for the per size benchmarks
+# p99 solve_board latency each board size must stay under, whatever the
+# baseline: solving runs when a game starts, so it must not be noticeable
+LATENCY_TARGETS_MS = {4: 50, 5: 100, 6: 200}
+
+# boards dense with common letters, where the search goes deepest
+DENSE_BOARDS = [
+    [['S', 'E', 'R', 'S'], ['P', 'A', 'T', 'G'], ['L', 'I', 'N', 'E'],
+     ['S', 'E', 'R', 'S']],
+    [['E', 'S', 'T', 'E'], ['R', 'A', 'E', 'S'], ['T', 'I', 'N', 'E'],
+     ['S', 'E', 'R', 'D']],
+    [['R', 'E', 'S', 'T'], ['A', 'I', 'N', 'E'], ['S', 'T', 'E', 'R'],
+     ['L', 'A', 'T', 'E']],
+]
+QU_BOARDS = [
+    [['QU', 'A', 'R', 'T'], ['I', 'E', 'S', 'E'], ['T', 'N', 'E', 'R'],
+     ['S', 'D', 'A', 'L']],
+    [['S', 'QU', 'I', 'R'], ['T', 'E', 'A', 'E'], ['N', 'R', 'L', 'S'],
+     ['G', 'I', 'E', 'D']],
+]
+
+
+def corpus():
+    """
+    :return: list of (name, board) of the benchmarked boards
+    """
+    generator = randomizer.BoardGenerator(CORPUS_SEED)
+    boards = [('random%d' % i, generator.generate())
+              for i in range(RANDOM_BOARDS)]
+    boards += [('dense%d' % i, board) for i, board in enumerate(DENSE_BOARDS)]
+    boards += [('qu%d' % i, board) for i, board in enumerate(QU_BOARDS)]
+    return boards
+
+
+def sized_corpus(size):
+    """
+    :return: list of random boards of size x size
+    """
+    generator = randomizer.BoardGenerator(CORPUS_SEED,
+                                          randomizer.DICE_SETS[size])
+    return [generator.generate() for _ in range(SIZED_BOARDS)]
+
+
+def solve_benchmark_name(size):
+    return 'solve_board_%dx%d' % (size, size)
+
+
+def percentile(sorted_values, p):
+    """
+    :return: the p-th percentile of sorted values (nearest rank)
+    """
+    rank = max(int(round(p / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def measure(calls):
+    """
+    Time each call (fastest of REPEATS runs), then run all of them once more
+    to get the peak memory (timing and tracing at once would skew timings)
+    :param calls: list of functions without arguments
+    :return: dict of the results
+    """
+    latencies = []
+    for call in calls:
+        fastest = None
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - start
+            if fastest is None or elapsed < fastest:
+                fastest = elapsed
+        latencies.append(fastest)
+    latencies.sort()
+
+    tracemalloc.start()
+    for call in calls:
+        call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    results = {'p%d_ms' % p: percentile(latencies, p) * 1000
+               for p in PERCENTILES}
+    results['peak_kb'] = peak / 1024
+    results['calls'] = len(calls)
+    return results
+
+
+def run_benchmarks():
+    """
+    :return: dict mapping each benchmark name to its results
+    """
+    results = dict()
+
+    results['load_words_from_file'] = measure(
+        [lambda: utils.load_words_from_file(DICT_PATH)])
+    words = list(utils.load_words_from_file(DICT_PATH))
+    results['lexicon_build'] = measure(
+        [lambda: boggle_lexicon.Lexicon(words)])
+    lexicon = boggle_lexicon.Lexicon(words)
+
+    fd, packed_path = tempfile.mkstemp(suffix=boggle_lexicon.COMPILED_SUFFIX)
+    os.close(fd)
+    try:
+        boggle_lexicon.compile_lexicon(lexicon, packed_path)
+        results['packed_lexicon_load'] = measure(
+            [lambda: boggle_lexicon.PackedLexicon(packed_path)])
+    finally:
+        os.remove(packed_path)
+
+    boards = [board for name, board in corpus()]
+    results['find_length_n_paths'] = measure(
+        [lambda n=n, board=board: utils.find_length_n_paths(n, board, lexicon)
+         for board in boards for n in LENGTHS])
+    results['find_length_n_words'] = measure(
+        [lambda n=n, board=board: utils.find_length_n_words(n, board, lexicon)
+         for board in boards for n in LENGTHS])
+    results['max_score_paths'] = measure(
+        [lambda board=board: utils.max_score_paths(board, lexicon)
+         for board in boards])
+    results['max_score'] = measure(
+        [lambda board=board: utils.max_score(board, lexicon)
+         for board in boards])
+
+    paths = [(board, path) for board in boards
+             for path in utils.max_score_paths(board, lexicon)]
+    results['is_valid_path'] = measure(
+        [lambda board=board, path=path: utils.is_valid_path(board, path,
+                                                            lexicon)
+         for board, path in paths])
+
+    for size in sorted(LATENCY_TARGETS_MS):
+        results[solve_benchmark_name(size)] = measure(
+            [lambda board=board: utils.solve_board(board, lexicon)
+             for board in sized_corpus(size)])
+    return results
+
+
+def regressions(results, baseline, tolerance):
+    """
+    :return: list of messages, one per result worse than the baseline by
+    more than the tolerance factor
+    """
+    messages = []
+    for name, baseline_results in baseline.items():
+        for key, baseline_value in baseline_results.items():
+            if key == 'calls' or name not in results:
+                continue
+            value = results[name].get(key)
+            if value is None or value <= baseline_value * tolerance:
+                continue
+            if key.endswith('_ms') and \
+                    value - baseline_value < MIN_REGRESSION_MS:
+                continue
+            messages.append('%s %s: %.3f (baseline %.3f)'
+                            % (name, key, value, baseline_value))
+    return messages
+
+
+def missed_targets(results):
+    """
+    :return: list of messages, one per board size whose p99 solving latency
+    is over its target
+    """
+    messages = []
+    for size, target in sorted(LATENCY_TARGETS_MS.items()):
+        name = solve_benchmark_name(size)
+        if name in results and results[name]['p99_ms'] > target:
+            messages.append('%s p99_ms: %.3f (target %d)'
+                            % (name, results[name]['p99_ms'], target))
+    return messages
+
+
+def print_results(results):
+    columns = ['p%d_ms' % p for p in PERCENTILES] + ['peak_kb', 'calls']
+    print('%-22s' % 'benchmark' + ''.join('%12s' % c for c in columns))
+    for name, values in results.items():
+        print('%-22s' % name +
+              ''.join('%12.3f' % values[c] if c != 'calls'
+                      else '%12d' % values[c] for c in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Boggle solver benchmarks')
+    parser.add_argument('--save', metavar='FILE',
+                        help='store the results as a baseline')
+    parser.add_argument('--check', metavar='FILE', nargs='?',
+                        const=BASELINE_PATH,
+                        help='compare against a baseline (default: %s)'
+                             % BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed slowdown factor (default: %s)'
+                             % DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks()
+    print_results(results)
+
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+    if args.check:
+        with open(args.check) as baseline_file:
+            baseline = json.load(baseline_file)
+        messages = regressions(results, baseline, args.tolerance)
+        for message in messages:
+            print('REGRESSION ' + message)
+        targets = missed_targets(results)
+        for message in targets:
+            print('TARGET MISSED ' + message)
+        if messages or targets:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
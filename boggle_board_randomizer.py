@@ -1,4 +1,8 @@
+import argparse
+import json
+import multiprocessing
 import random
+import sys
 
 BOARD_SIZE = 4
 LETTERS = [
@@ -20,21 +24,246 @@ LETTERS = [
     ['N', 'U', 'I', 'H', 'M', 'QU']
 ]
 
+# Big Boggle, 5x5
+BIG_LETTERS = [
+    ['A', 'A', 'A', 'F', 'R', 'S'],
+    ['A', 'A', 'E', 'E', 'E', 'E'],
+    ['A', 'A', 'F', 'I', 'R', 'S'],
+    ['A', 'D', 'E', 'N', 'N', 'N'],
+    ['A', 'E', 'E', 'E', 'E', 'M'],
+    ['A', 'E', 'E', 'G', 'M', 'U'],
+    ['A', 'E', 'G', 'M', 'N', 'N'],
+    ['A', 'F', 'I', 'R', 'S', 'Y'],
+    ['B', 'J', 'K', 'QU', 'X', 'Z'],
+    ['C', 'C', 'N', 'S', 'T', 'W'],
+    ['C', 'E', 'I', 'I', 'L', 'T'],
+    ['C', 'E', 'I', 'L', 'P', 'T'],
+    ['C', 'E', 'I', 'P', 'S', 'T'],
+    ['D', 'D', 'L', 'N', 'O', 'R'],
+    ['D', 'H', 'H', 'L', 'O', 'R'],
+    ['D', 'H', 'H', 'N', 'O', 'T'],
+    ['D', 'H', 'L', 'N', 'O', 'R'],
+    ['E', 'I', 'I', 'I', 'T', 'T'],
+    ['E', 'M', 'O', 'T', 'T', 'T'],
+    ['E', 'N', 'S', 'S', 'S', 'U'],
+    ['F', 'I', 'P', 'R', 'S', 'Y'],
+    ['G', 'O', 'R', 'R', 'V', 'W'],
+    ['H', 'I', 'P', 'R', 'R', 'Y'],
+    ['N', 'O', 'O', 'T', 'U', 'W'],
+    ['O', 'O', 'O', 'T', 'T', 'U']
+]
+
+# Super Big Boggle, 6x6: the Big Boggle dice and 11 more, the blank and two
+# letters faces of the original dice (except QU) are replaced by single letters
+SUPER_BIG_LETTERS = BIG_LETTERS + [
+    ['A', 'A', 'E', 'E', 'O', 'O'],
+    ['A', 'B', 'D', 'E', 'I', 'O'],
+    ['A', 'E', 'I', 'L', 'M', 'N'],
+    ['A', 'E', 'I', 'N', 'O', 'U'],
+    ['C', 'D', 'D', 'L', 'N', 'N'],
+    ['C', 'F', 'G', 'N', 'U', 'Y'],
+    ['D', 'H', 'H', 'N', 'O', 'W'],
+    ['E', 'H', 'I', 'L', 'R', 'S'],
+    ['E', 'I', 'I', 'L', 'S', 'T'],
+    ['H', 'I', 'R', 'S', 'T', 'V'],
+    ['I', 'P', 'R', 'S', 'Y', 'Y']
+]
+
+# board size -> dice of that size
+DICE_SETS = {4: LETTERS, 5: BIG_LETTERS, 6: SUPER_BIG_LETTERS}
+
+# every tile a die face may show, the index of a tile is its letter code
+TILES = [chr(ord('A') + i) for i in range(26)] + ['QU']
+TILE_CODES = {tile: code for code, tile in enumerate(TILES)}
+
+
+def encode_board(board):
+    """
+    :param board: 2 dimensional list of tiles
+    :return: 2 dimensional list of the letter codes of the tiles
+    """
+    return [[TILE_CODES[tile] for tile in row] for row in board]
+
 
-def randomize_board(dice_list=LETTERS):
+def decode_board(codes):
+    """
+    :param codes: 2 dimensional sequence of letter codes
+    :return: 2 dimensional list of tiles
+    """
+    return [[TILES[code] for code in row] for row in codes]
+
+
+def randomize_board(dice_list=LETTERS, rng=random):
+    """
+    :param dice_list: list of the dice, each a list of its faces, the board
+    side is the square root of the number of dice (see DICE_SETS)
+    :param rng: source of randomness, the random module or a random.Random
+    :return: 2 dimensional list of a random board
+    """
+    size = int(len(dice_list) ** 0.5)
     dice_indices = list(range(len(dice_list)))
-    random.shuffle(dice_indices)
+    rng.shuffle(dice_indices)
     dice_indices_iter = iter(dice_indices)
     board = []
-    for i in range(BOARD_SIZE):
+    for i in range(size):
         row = []
-        for j in range(BOARD_SIZE):
+        for j in range(size):
             die = dice_list[next(dice_indices_iter)]
-            letter = random.choice(die)
+            letter = rng.choice(die)
             row.append(letter)
         board.append(row)
     return board
 
-if __name__=="__main__":
-    from pprint import pprint
-    pprint(randomize_board())
+
+class BoardGenerator:
+    """
+    Random boards generator with its own seeded random state, so that the
+    same seed always gives the same boards.
+    Boards can be generated packed: one byte per cell, holding the letter
+    code of the tile (see TILES), cells row by row. The packed boards of
+    generate_many can be read by numpy as an (N, size, size) array with
+    numpy.frombuffer(packed, numpy.uint8).reshape(-1, size, size).
+    """
+
+    def __init__(self, seed=None, dice_list=LETTERS):
+        """
+        :param seed: seed of the random state (int, str or bytes), None for a
+        random seed
+        :param dice_list: list of the dice, each a list of its faces
+        """
+        self.__rng = random.Random(seed)
+        self.__dice_codes = [[TILE_CODES[face] for face in die]
+                             for die in dice_list]
+        self.__order = list(range(len(dice_list)))
+        self.size = int(len(dice_list) ** 0.5)
+        if self.size ** 2 != len(dice_list):
+            raise ValueError('the number of dice must be a square')
+
+    def generate(self):
+        """
+        :return: 2 dimensional list of a random board
+        """
+        return unpack_board(self.generate_many(1), self.size)
+
+    def generate_many(self, n):
+        """
+        :param n: number of boards
+        :return: bytes of the n packed boards, one after the other
+        """
+        cells = len(self.__order)
+        packed = bytearray(n * cells)
+        order = self.__order
+        dice_codes = self.__dice_codes
+        shuffle = self.__rng.shuffle
+        choice = self.__rng.choice
+        for start in range(0, n * cells, cells):
+            shuffle(order)
+            for cell, die_index in enumerate(order, start):
+                packed[cell] = choice(dice_codes[die_index])
+        return bytes(packed)
+
+
+def unpack_board(packed, size=BOARD_SIZE, index=0):
+    """
+    :param packed: bytes of packed boards
+    :param size: length of the board side
+    :param index: index of the board in packed
+    :return: 2 dimensional list of the tiles of the board
+    """
+    start = index * size * size
+    return [[TILES[code] for code in packed[row:row + size]]
+            for row in range(start, start + size * size, size)]
+
+
+# lexicon of an analysis worker process, loaded once by _init_worker
+_worker_lexicon = None
+
+
+def _init_worker(dict_path):
+    global _worker_lexicon
+    import boggle_lexicon
+    # a compiled dictionary is memory-mapped, so all the workers share it
+    _worker_lexicon = boggle_lexicon.load_lexicon(dict_path)
+
+
+def _analyze_chunk(task):
+    """
+    Generate and solve a chunk of boards in a worker process
+    :param task: (seed, chunk index, number of boards, board size)
+    :return: the JSON lines of the boards
+    """
+    import ex12_utils
+    seed, chunk, count, size = task
+    # every chunk has its own seed, so the output doesn't depend on which
+    # worker handles which chunk
+    generator = BoardGenerator('%d:%d' % (seed, chunk), DICE_SETS[size])
+    packed = generator.generate_many(count)
+    lines = []
+    for i in range(count):
+        board = unpack_board(packed, generator.size, i)
+        paths = ex12_utils.max_score_paths(board, _worker_lexicon)
+        lines.append(json.dumps({
+            'board': '/'.join(''.join(row) for row in board),
+            'words': len(paths),
+            'max_score': sum(len(path) ** 2 for path in paths)}) + '\n')
+    return ''.join(lines)
+
+
+def analyze(count, output, seed=0, workers=None, chunk_size=1000,
+            dict_path='boggle_dict.txt', size=BOARD_SIZE):
+    """
+    Generate random boards and solve them on all the cores, writing one JSON
+    line per board (board rows separated by '/', word count and max score)
+    :param count: number of boards
+    :param output: file object to write the lines to
+    :param seed: seed of the whole run, the same seed gives the same output
+    :param workers: number of worker processes, all the cores by default
+    :param chunk_size: number of boards per task sent to a worker
+    :param dict_path: dictionary file
+    :param size: board size, one of DICE_SETS
+    """
+    # the lexicon and the solver are only imported for the analysis, the
+    # lexicon imports this module for its dice
+    import boggle_lexicon
+    # load before forking, so that forked workers find it in the cache
+    boggle_lexicon.load_lexicon(dict_path)
+    tasks = [(seed, chunk, min(chunk_size, count - start), size)
+             for chunk, start in enumerate(range(0, count, chunk_size))]
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(dict_path,)) as pool:
+        for lines in pool.imap(_analyze_chunk, tasks):
+            output.write(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Print a random board, or analyze many of them')
+    parser.add_argument('--analyze', type=int, metavar='COUNT',
+                        help='generate and solve COUNT boards')
+    parser.add_argument('-o', '--output',
+                        help='JSON lines output file (default: stdout)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int,
+                        help='worker processes (default: all the cores)')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--dict', default='boggle_dict.txt',
+                        help='dictionary file, words or compiled')
+    parser.add_argument('--size', type=int, default=BOARD_SIZE,
+                        choices=sorted(DICE_SETS))
+    args = parser.parse_args(argv)
+
+    if args.analyze is None:
+        from pprint import pprint
+        pprint(randomize_board(DICE_SETS[args.size]))
+        return
+    if args.output:
+        with open(args.output, 'w') as output:
+            analyze(args.analyze, output, args.seed, args.workers,
+                    args.chunk_size, args.dict, args.size)
+    else:
+        analyze(args.analyze, sys.stdout, args.seed, args.workers,
+                args.chunk_size, args.dict, args.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
+import bisect
+import time
 import tkinter
 import tkinter as tki
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+import boggle_assets as assets
+import boggle_profile as profile
+from boggle_assets import BASE_BOARD_SIZE
 
 TOP_COLOR = '#d64d3c'
 RIGHT_SIDE_COLOR = '#1a1a1a'
@@ -8,41 +14,506 @@ BOTTOM_COLOR = '#ffc67f'
 HINT_COLOR = '#553fd0'
 MAIN_FONT = 'Aharoni'
 
+# the layout is designed for a 4x4 board, letter buttons are scaled down for larger boards
+BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_PADDING = 125, 140, 20
+LETTER_FONT_SIZE, COVER_FONT_SIZE, SCORE_FONT_SIZE = 40, 11, 14
+FRAME_TIME = 25  # animation delays are rounded to it, the frames due within half of it are run together
+BLINK_FRAMES = 6
+
+# found words panel
+WORD_ROW_HEIGHT = 22
+WORDS_ROWS = 10  # rows in view until the panel is laid out
+WORDS_WIDTH = 150
+WHEEL_ROWS = 3  # rows scrolled by a mouse wheel notch
+ROWS_CHUNK = 256  # most rows of a chunk of SortedRows
+# orders of the found words: the order they were found, alphabetical, grouped by length or by score
+FOUND_ORDER, ALPHABETICAL_ORDER, LENGTH_ORDER, SCORE_ORDER = 'found', 'a-z', 'length', 'score'
+WORD_ORDERS = (FOUND_ORDER, ALPHABETICAL_ORDER, LENGTH_ORDER, SCORE_ORDER)
+GROUPED_ORDERS = (LENGTH_ORDER, SCORE_ORDER)
+
+
+class BoardView:
+    """
+    The letter buttons of the board, indexed by coordinate and by button, so that
+    both lookups take constant time.
+    It also keeps the display options of each button: changes are queued with update()
+    and applied together by flush(), one config call per changed button, since every
+    call to Tk may be a round trip to a remote display.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        :param size: length of the board side
+        """
+        self.__grid: List[List[Optional[tki.Button]]] = [[None] * size for _ in range(size)]
+        # each button's record: [button's text, (row, col), True if selected]
+        self.records: Dict[tki.Button, list] = {}
+        # options of each button, queued changes included
+        self.__options: Dict[tki.Button, Dict[str, Any]] = {}
+        # queued changes of the buttons which changed since the last flush
+        self.__dirty: Dict[tki.Button, Dict[str, Any]] = {}
+
+    def add(self, button: tki.Button, button_char: str, row: int, col: int, options: Dict[str, Any]) -> None:
+        """
+        :param options: display options the button was created with
+        """
+        self.__grid[row][col] = button
+        self.records[button] = [button_char, (row, col), False]
+        self.__options[button] = dict(options)
+
+    def update(self, button: tki.Button, options: Dict[str, Any]) -> bool:
+        """
+        Queue changes of a button's options, the options it already has are ignored
+        :return: True if the button has queued changes
+        """
+        current = self.__options[button]
+        changes = {name: value for name, value in options.items() if current.get(name) != value}
+        if changes:
+            current.update(changes)
+            self.__dirty.setdefault(button, {}).update(changes)
+        return button in self.__dirty
+
+    def option(self, button: tki.Button, name: str) -> Any:
+        """
+        :return: the value of a button's option, as it is once the queued changes are applied
+        """
+        return self.__options[button].get(name)
+
+    def flush(self) -> None:
+        """
+        Apply the queued changes
+        """
+        dirty, self.__dirty = self.__dirty, {}
+        for button, changes in dirty.items():
+            button.config(**changes)
+
+    def button(self, coordinate) -> tki.Button:
+        return self.__grid[coordinate[0]][coordinate[1]]
+
+    def coordinate(self, button: tki.Button):
+        return self.records[button][1]
+
+    def buttons(self) -> List[tki.Button]:
+        """
+        :return: list of the buttons, row by row
+        """
+        return [button for row in self.__grid for button in row if button is not None]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class Animator:
+    """
+    Runs all the animations on a single frame clock: the active animations are kept in a list and one timer
+    advances them. The timer is set for the earliest frame due, so there's one callback per frame time at which
+    some animation has a frame, and none while there are no animations.
+    An animation is an iterator doing one frame per step.
+    """
+
+    def __init__(self, root: tki.Tk) -> None:
+        self.__root = root
+        # each animation: [frames iterator, ms between frames, time of its next frame in ms]
+        self.__animations: List[list] = []
+        self.__timer_id = None
+        self.__timer_time = 0.0  # time the timer is set for, in ms
+
+    @staticmethod
+    def __now() -> float:
+        return time.perf_counter() * 1000
+
+    def start(self, frames, delay: int) -> None:
+        """
+        Run the first frame of an animation now, and the next ones every delay
+        :param frames: iterator of the animation frames
+        :param delay: time between frames in ms
+        """
+        animation = [frames, max(round(delay / FRAME_TIME), 1) * FRAME_TIME, self.__now()]
+        if not self.__advance(animation):
+            return
+        self.__animations.append(animation)
+        self.__schedule()
+
+    def __advance(self, animation: list) -> bool:
+        """
+        Run the next frame of an animation
+        :return: False if the animation is over
+        """
+        try:
+            next(animation[0])
+        except StopIteration:
+            return False
+        animation[2] += animation[1]
+        return True
+
+    def __schedule(self) -> None:
+        """
+        Set the timer for the earliest frame due, unless it's already set for an earlier time
+        """
+        next_time = min(animation[2] for animation in self.__animations)
+        if self.__timer_id is not None:
+            if self.__timer_time <= next_time:
+                return
+            self.__root.after_cancel(self.__timer_id)
+        self.__timer_time = next_time
+        self.__timer_id = self.__root.after(max(round(next_time - self.__now()), 0), self.__on_tick)
+
+    def __on_tick(self) -> None:
+        self.__timer_id = None
+        # the frames due within half a frame time are run together
+        now = max(self.__now(), self.__timer_time) + FRAME_TIME / 2
+        self.__animations = [animation for animation in self.__animations
+                             if animation[2] > now or self.__advance(animation)]
+        if self.__animations:
+            self.__schedule()
+
+    def cancel(self) -> None:
+        """
+        Stop all the animations, their remaining frames aren't run
+        """
+        if self.__timer_id is not None:
+            self.__root.after_cancel(self.__timer_id)
+            self.__timer_id = None
+        self.__animations = []
+
+    def __len__(self) -> int:
+        return len(self.__animations)
+
+
+class SortedRows:
+    """
+    A sorted list of rows, split into chunks of at most ROWS_CHUNK rows, so that adding a row moves the rows of a
+    single chunk instead of the rows after it in the whole list. A Fenwick tree of the lengths of the chunks gives
+    the index of a row, and the chunk of an index, in O(log n).
+    """
+
+    def __init__(self, rows=()) -> None:
+        rows = sorted(rows)
+        self.__chunks: List[list] = [rows[i:i + ROWS_CHUNK] for i in range(0, len(rows), ROWS_CHUNK)]
+        self.__maxes: List[Any] = [chunk[-1] for chunk in self.__chunks]  # last row of each chunk
+        self.__length = len(rows)
+        self.__build_tree()
+
+    def __build_tree(self) -> None:
+        # 1-based Fenwick tree: tree[i] is the number of rows of the chunks (i - (i & -i), i]
+        tree = [0] * (len(self.__chunks) + 1)
+        for i, chunk in enumerate(self.__chunks, 1):
+            tree[i] += len(chunk)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.__tree = tree
+
+    def __rows_before(self, chunk_index: int) -> int:
+        """
+        :return: number of rows in the chunks before a chunk
+        """
+        count = 0
+        while chunk_index > 0:
+            count += self.__tree[chunk_index]
+            chunk_index -= chunk_index & -chunk_index
+        return count
+
+    def add(self, row: Any) -> int:
+        """
+        :return: index of the row
+        """
+        self.__length += 1
+        if not self.__chunks:
+            self.__chunks.append([row])
+            self.__maxes.append(row)
+            self.__build_tree()
+            return 0
+        chunk_index = min(bisect.bisect_left(self.__maxes, row), len(self.__chunks) - 1)
+        chunk = self.__chunks[chunk_index]
+        position = bisect.bisect(chunk, row)
+        chunk.insert(position, row)
+        self.__maxes[chunk_index] = chunk[-1]
+        index = self.__rows_before(chunk_index) + position
+        if len(chunk) > ROWS_CHUNK:
+            # split the chunk in halves, the tree is rebuilt once every ROWS_CHUNK / 2 rows added at most
+            half = len(chunk) // 2
+            self.__chunks[chunk_index:chunk_index + 1] = [chunk[:half], chunk[half:]]
+            self.__maxes[chunk_index:chunk_index + 1] = [chunk[half - 1], chunk[-1]]
+            self.__build_tree()
+        else:
+            i = chunk_index + 1
+            while i < len(self.__tree):
+                self.__tree[i] += 1
+                i += i & -i
+        return index
+
+    def __getitem__(self, index: int) -> Any:
+        if not 0 <= index < self.__length:
+            raise IndexError('row index out of range')
+        # descend the tree to the chunk holding the row
+        chunk_index, step = 0, 1 << (len(self.__tree) - 1).bit_length()
+        while step:
+            following = chunk_index + step
+            if following < len(self.__tree) and self.__tree[following] <= index:
+                chunk_index = following
+                index -= self.__tree[following]
+            step >>= 1
+        return self.__chunks[chunk_index][index]
+
+    def __len__(self) -> int:
+        return self.__length
+
+
+class WordList:
+    """
+    The found words and the rows showing them: the words matching the filter, in the current order, under a
+    header for each group in the length and score orders.
+    The rows are kept sorted by key in a SortedRows, so that adding a word doesn't need a new sort.
+    """
+
+    def __init__(self, order: str = FOUND_ORDER, text_filter: str = '') -> None:
+        """
+        :param order: one of WORD_ORDERS
+        :param text_filter: only the words containing it are shown
+        """
+        self.order = order
+        self.text_filter = text_filter.upper()
+        # (word, score) of each word, in the order they were found
+        self.__found: List[tuple] = []
+        # sorted keys of the rows, a word's key: (group, 1, sort key, word), a header's key: (group, 0, text)
+        self.__rows = SortedRows()
+        # number of words shown in each group, a group has a header while it's not empty
+        self.__group_sizes: Dict[int, int] = {}
+
+    def __key(self, word: str, score: int, index: int) -> tuple:
+        """
+        :param index: index of the word in the found order
+        """
+        if self.order == LENGTH_ORDER:
+            return -len(word), 1, word, word
+        if self.order == SCORE_ORDER:
+            return -score, 1, word, word
+        return 0, 1, index if self.order == FOUND_ORDER else word, word
+
+    def __header(self, group: int) -> tuple:
+        text = '%d LETTERS' % -group if self.order == LENGTH_ORDER else '+%d' % -group
+        return group, 0, text
+
+    def __insert(self, key: tuple) -> int:
+        """
+        Add the row of a word, and the header of its group if it's the first word shown in it
+        :return: index of the row
+        """
+        group = key[0]
+        if self.order in GROUPED_ORDERS and not self.__group_sizes.get(group):
+            self.__rows.add(self.__header(group))
+        self.__group_sizes[group] = self.__group_sizes.get(group, 0) + 1
+        return self.__rows.add(key)
+
+    def add(self, word: str, score: int) -> Optional[int]:
+        """
+        :return: index of the row of the word, None if the filter hides it
+        """
+        self.__found.append((word, score))
+        if self.text_filter not in word.upper():
+            return None
+        return self.__insert(self.__key(word, score, len(self.__found) - 1))
+
+    def set_order(self, order: str) -> None:
+        self.order = order
+        self.__rebuild()
+
+    def set_filter(self, text_filter: str) -> None:
+        self.text_filter = text_filter.upper()
+        self.__rebuild()
+
+    def __rebuild(self) -> None:
+        rows = []
+        self.__group_sizes = {}
+        keys = sorted(self.__key(word, score, index) for index, (word, score) in enumerate(self.__found)
+                      if self.text_filter in word.upper())
+        for key in keys:
+            if self.order in GROUPED_ORDERS and not self.__group_sizes.get(key[0]):
+                rows.append(self.__header(key[0]))
+            self.__group_sizes[key[0]] = self.__group_sizes.get(key[0], 0) + 1
+            rows.append(key)
+        self.__rows = SortedRows(rows)
+
+    def row(self, index: int) -> tuple:
+        """
+        :return: (text, True if it's a group header) of a row
+        """
+        key = self.__rows[index]
+        return key[-1], key[1] == 0
+
+    @property
+    def words_count(self) -> int:
+        return len(self.__found)
+
+    def __len__(self) -> int:
+        return len(self.__rows)
+
+
+class WordsPanel:
+    """
+    The found words panel: a filter, the order of the words, and their list, drawn on a canvas which holds only
+    the rows in view. The texts of a fixed set of canvas items are changed when the list scrolls or changes, so
+    adding a word costs the same however many words were found. Redraws are made once Tk is idle, like the
+    changes of the letter buttons.
+    """
+
+    def __init__(self, master: tki.Widget, order: str = FOUND_ORDER) -> None:
+        """
+        :param master: widget holding the panel
+        :param order: one of WORD_ORDERS
+        """
+        self.words = WordList(order)
+        self.__top = 0  # index of the first row in view
+        self.__items: List[int] = []  # canvas text items of the rows in view, top to bottom
+        self.__shown: List[tuple] = []  # (text, header) shown by each item
+        self.__redraw_id = None
+
+        self.frame = tki.Frame(master, background=RIGHT_SIDE_COLOR)
+        self.__filter = tki.StringVar()
+        self.__filter.trace_add('write', self.__on_filter)
+        self.__filter_entry = tki.Entry(self.frame, textvariable=self.__filter, font=(MAIN_FONT, 12),
+                                        background=RIGHT_SIDE_COLOR, fg='#fff', insertbackground='#fff',
+                                        highlightthickness=1, highlightbackground=HINT_COLOR, bd=0, width=0)
+        self.__order_button = tki.Button(self.frame, font=(MAIN_FONT, 9), background=RIGHT_SIDE_COLOR,
+                                         activebackground=HINT_COLOR, fg='#fff', highlightthickness=0, bd=0,
+                                         command=self.next_order, text=self.__order_text())
+        self.__canvas = tki.Canvas(self.frame, background=RIGHT_SIDE_COLOR, highlightthickness=0, bd=0,
+                                   width=WORDS_WIDTH, height=WORDS_ROWS * WORD_ROW_HEIGHT)
+        self.__scrollbar = tki.Scrollbar(self.frame, command=self.yview)
+        self.__canvas.bind('<Configure>', self.__on_resize)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.__canvas.bind(sequence, self.__on_wheel)
+
+        self.__filter_entry.pack(side=tki.TOP, fill=tki.X, padx=5)
+        self.__order_button.pack(side=tki.TOP, fill=tki.X, padx=5)
+        self.__scrollbar.pack(side=tki.RIGHT, fill=tki.Y)
+        self.__canvas.pack(side=tki.LEFT, fill=tki.BOTH, expand=True, padx=5)
+        self.__set_rows_count(WORDS_ROWS)
+
+    @profile.timed('add_word')
+    def add(self, word: str, score: int) -> None:
+        rows_count = len(self.words)
+        index = self.words.add(word, score)
+        if index is not None and index - (len(self.words) - rows_count - 1) < self.__top:
+            # keep the rows in view in place when rows are added above them
+            self.__top += len(self.words) - rows_count
+        self.__schedule_redraw()
+
+    def next_order(self) -> None:
+        """
+        Show the words in the next order of WORD_ORDERS
+        """
+        self.words.set_order(WORD_ORDERS[(WORD_ORDERS.index(self.words.order) + 1) % len(WORD_ORDERS)])
+        self.__order_button.config(text=self.__order_text())
+        self.__top = 0
+        self.__schedule_redraw()
+
+    def __order_text(self) -> str:
+        return 'ORDER: ' + self.words.order.upper()
+
+    def __on_filter(self, *args) -> None:
+        self.words.set_filter(self.__filter.get())
+        self.__top = 0
+        self.__schedule_redraw()
+
+    def yview(self, *args) -> None:
+        """
+        Scroll the list, called by the scrollbar with the arguments of a Tk yview command
+        """
+        rows_count = len(self.__items)
+        if args[0] == 'moveto':
+            self.__top = round(float(args[1]) * len(self.words))
+        elif args[0] == 'scroll':
+            self.__top += int(args[1]) * (rows_count if args[2] == 'pages' else 1)
+        self.__schedule_redraw()
+
+    def __on_wheel(self, event: Any) -> None:
+        up = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.yview('scroll', -WHEEL_ROWS if up else WHEEL_ROWS, 'units')
+
+    def __on_resize(self, event: Any) -> None:
+        self.__set_rows_count(max(event.height // WORD_ROW_HEIGHT, 1))
+
+    def __set_rows_count(self, rows_count: int) -> None:
+        """
+        Create or delete the canvas items so that there's one for each row in view, plus a partly shown one
+        """
+        rows_count += 1
+        while len(self.__items) < rows_count:
+            y = len(self.__items) * WORD_ROW_HEIGHT + WORD_ROW_HEIGHT // 2
+            self.__items.append(self.__canvas.create_text(0, y, anchor=tki.W, text='', fill='#fff',
+                                                          font=(MAIN_FONT, 12)))
+            self.__shown.append(('', False))
+        for item in self.__items[rows_count:]:
+            self.__canvas.delete(item)
+        del self.__items[rows_count:], self.__shown[rows_count:]
+        self.__schedule_redraw()
+
+    def __schedule_redraw(self) -> None:
+        if self.__redraw_id is None:
+            self.__redraw_id = self.__canvas.after_idle(self.__redraw)
+
+    @profile.timed('redraw_words')
+    def __redraw(self) -> None:
+        self.__redraw_id = None
+        rows_count = len(self.words)
+        # the last item is only partly in view
+        self.__top = max(min(self.__top, rows_count - len(self.__items) + 1), 0)
+        for position, item in enumerate(self.__items):
+            index = self.__top + position
+            shown = self.words.row(index) if index < rows_count else ('', False)
+            if self.__shown[position] != shown:
+                text, header = shown
+                self.__canvas.itemconfig(item, text=text, fill=BOTTOM_COLOR if header else '#fff',
+                                         font=(MAIN_FONT, 10 if header else 12, 'bold' if header else 'normal'))
+                self.__shown[position] = shown
+        if rows_count:
+            self.__scrollbar.set(self.__top / rows_count,
+                                 min((self.__top + len(self.__items) - 1) / rows_count, 1))
+        else:
+            self.__scrollbar.set(0, 1)
+
+    def cancel(self) -> None:
+        """
+        Cancel the queued redraw, before the panel is destroyed
+        """
+        if self.__redraw_id is not None:
+            self.__canvas.after_cancel(self.__redraw_id)
+            self.__redraw_id = None
+
 
 class BoggleGUI:
-    _buttons: Dict[str, tki.Button] = {}
+    _board_view: BoardView
 
     def __init__(self, board) -> None:
         """
-        Initialize GUI with given 4x4 board list
+        Initialize GUI with given NxN board list
         :param board: 2 dimensional lists representing the game board
         """
+        start_time = time.perf_counter()
         # initialize root settings
         self.root = tki.Tk()
         self.root.configure(background='black')
         self.root.title("BOGGLE - Made by Itai & Idan")
         self.root.resizable(False, False)
 
-        # set gradient background image
-        self._background_image = tki.PhotoImage(file='images/bg2.png')
-
-        # set images attributes, these are attributes in order to prevent removal by the garbage collector.
-        self._button_image = tki.PhotoImage(file='images/button_bg2.png')
-        self._button_warning = tki.PhotoImage(file='images/alert_button.png')
-        self._button_success = tki.PhotoImage(file='images/success_button.png')
-        self._hint_letter_button = tki.PhotoImage(file='images/hint_letter_button.png')
-        self._selected_button_image = tki.PhotoImage(file='images/button_clicked.png')
-        self._hover_button_image = tki.PhotoImage(file='images/selected_button.png')
-        self._clock_image = tki.PhotoImage(file='images/time.png')
-        self._logo_image = tki.PhotoImage(file='images/logo.png')
-        self._hint_button_image = tki.PhotoImage(file='images/hint_button.png')
-        self._hint_button_hover_image = tki.PhotoImage(file='images/hint_button_dark.png')
-        self._restart_button_image = tki.PhotoImage(file='images/restart_button.png')
-        self._restart_button_image_hover = tki.PhotoImage(file='images/restart_button_dark.png')
+        # images are loaded when first used, the cache also prevents their removal by the garbage collector
+        self._assets = assets.AssetCache(self.root)
+        self.__size = None
+        self.__flush_id = None
+        self.__message_id = None
+        self._words_panel = None
+        self._animator = Animator(self.root)
         self._main_window = self.root
+        self.startup_time = None  # seconds from the creation of the GUI to its first frame
 
         # creates the gui
         self.reset(board)
+        self.root.after_idle(self.__first_frame, start_time)
+
+    def __first_frame(self, start_time):
+        self.startup_time = time.perf_counter() - start_time
 
     def reset(self, board):
         """
@@ -51,20 +522,67 @@ class BoggleGUI:
         :return:
         """
         self.__board = board
+        self.__size = len(board)
+        # the queued changes, animations and message timer are of the widgets about to be destroyed
+        if self.__flush_id is not None:
+            self.root.after_cancel(self.__flush_id)
+            self.__flush_id = None
+        if self.__message_id is not None:
+            self.root.after_cancel(self.__message_id)
+            self.__message_id = None
+        self._animator.cancel()
+        order = FOUND_ORDER
+        if self._words_panel is not None:
+            # the words of the previous game are dropped, their order is kept
+            self._words_panel.cancel()
+            order = self._words_panel.words.order
         for widget in self.root.winfo_children():
             widget.destroy()
-        self._buttons = {}
-        self.create_gui()
+        self._board_view = BoardView(len(board))
+        self.create_gui(order)
+
+    def _image(self, name):
+        """
+        :param name: name of an image of the images directory
+        :return: the image, letter buttons images are scaled to the board size
+        """
+        if name in assets.LETTER_BUTTON_IMAGES:
+            return self._assets.image(name, self.__size)
+        return self._assets.image(name)
+
+    def _scaled(self, value):
+        """
+        :param value: a letter buttons dimension (or font size) of a 4x4 board
+        :return: that dimension for the current board size
+        """
+        return value * BASE_BOARD_SIZE // self.__size
+
+    def _update_button(self, button, **options):
+        """
+        Change options of a letter button. The change is queued and applied along with the
+        other changes made until Tk is idle, once per event loop iteration.
+        :param button: a letter button
+        :param options: button options, as for button.config
+        :return: None
+        """
+        if self._board_view.update(button, options) and self.__flush_id is None:
+            self.__flush_id = self.root.after_idle(self.__flush_buttons)
 
-    def create_gui(self):
+    @profile.timed('flush_buttons')
+    def __flush_buttons(self):
+        self.__flush_id = None
+        self._board_view.flush()
+
+    def create_gui(self, words_order=FOUND_ORDER):
         """
         Creates the GUI using the tkinter library
         This function is separated from __init__ due to the restart game functionality
+        :param words_order: order of the found words, one of WORD_ORDERS
         :return: None
         """
         self._outer_frame = tki.Frame(self.root)
         background_label_1 = tki.Label(self._outer_frame,
-                                       image=self._background_image)
+                                       image=self._image('bg2'))
         background_label_1.place(x=1, y=1, relwidth=1, relheight=1)
         ###
         self._top_frame = tki.Frame(self._outer_frame)
@@ -76,9 +594,9 @@ class BoggleGUI:
                                        highlightcolor=TOP_COLOR,
                                        highlightthickness=7, bd=0, fg="#fff",
                                        text='SCORE: 0', width=30)
-        self._logo_label = tki.Label(self._top_frame, image=self._logo_image,
+        self._logo_label = tki.Label(self._top_frame, image=self._image('logo'),
                                      background=TOP_COLOR)
-        self._time_image = tki.Label(self._top_frame, image=self._clock_image,
+        self._time_image = tki.Label(self._top_frame, image=self._image('time'),
                                      background=TOP_COLOR)
         self._time_label = tki.Label(self._top_frame, font=(MAIN_FONT, 20),
                                      width=0, background=TOP_COLOR,
@@ -89,7 +607,7 @@ class BoggleGUI:
         # initialize letter area, and current guess area
         self._letters_area = tki.Frame(self._outer_frame)
         background_label_2 = tki.Label(self._letters_area,
-                                       image=self._background_image)
+                                       image=self._image('bg2'))
         background_label_2.place(x=1, y=1, relwidth=1, relheight=1)
         self._word_area = tki.Frame(self._outer_frame)
         self._word_label = tki.Label(self._word_area,
@@ -125,86 +643,82 @@ class BoggleGUI:
                                               highlightthickness=0, bd=0,
                                               fg="#fff", text='WORDS FOUND:')
 
-        self.list_of_words = tki.Listbox(self._guessed_words_area,
-                                         background=RIGHT_SIDE_COLOR,
-                                         highlightthickness=0,
-                                         bd=0, width=0, font=(MAIN_FONT, 12),
-                                         fg="#fff")
-        self._scrollbar = tki.Scrollbar(self._guessed_words_area)
-        self.list_of_words.config(yscrollcommand=self._scrollbar.set)
-        self._scrollbar.config(command=self.list_of_words.yview)
+        self._words_panel = WordsPanel(self._guessed_words_area, words_order)
 
         # pack everything
         self.pack()
 
     def get_buttons(self):
-        return self._buttons
+        return self._board_view.records
 
     def set_button_action(self, button, action):
         button.configure(command=action)
 
     def create_letters_buttons(self, beginning=False):
         """
-        Create Boggle letters 4x4 grid
+        Create Boggle letters NxN grid
         :return: None
         """
-        for i in range(4):
+        for i in range(self.__size):
             tki.Grid.columnconfigure(self._letters_area, i,
                                      weight=0)  # type: ignore
 
-        for i in range(4):
+        for i in range(self.__size):
             tki.Grid.rowconfigure(self._letters_area, i,
                                   weight=1)  # type: ignore
 
-        for i in range(4):
-            for j in range(4):
-                btn = self._make_button('PRESS\nANY TO \nREVEAL AND\nSTART', i, j)
-                btn.config(font=(MAIN_FONT, 11))
+        for i in range(self.__size):
+            for j in range(self.__size):
+                self._make_button('PRESS\nANY TO \nREVEAL AND\nSTART', i, j,
+                                  font=(MAIN_FONT, max(self._scaled(COVER_FONT_SIZE), 7)))
 
     def show_letters_content(self):
-        for i in range(4):
-            for j in range(4):
+        for i in range(self.__size):
+            for j in range(self.__size):
                 button = self.get_button_from_coordinate((i, j))
-                button.config(text=self.__board[i][j], font=(MAIN_FONT, 40, 'bold'))
+                self._update_button(button, text=self.__board[i][j],
+                                    font=(MAIN_FONT, self._scaled(LETTER_FONT_SIZE), 'bold'))
 
     def button_coordinate(self, button):
-        return self._buttons[button][1]
+        return self._board_view.coordinate(button)
 
     def reset_board(self):
         """
-        reset all buttons to default state
+        reset all buttons to default state, only the buttons which aren't in that state are updated
         :return: None
         """
-        for button in self._buttons:
-            button.config(image=self._button_image)
-            self._buttons[button][2] = False
+        for button, record in self._board_view.records.items():
+            self._update_button(button, image=self._image('button_bg2'))
+            record[2] = False
 
-    def _make_button(self, button_char: str, row: int, col: int):
+    def _make_button(self, button_char: str, row: int, col: int, font):
         """
         Create a GUI letter button and add it to the buttons dictionary
         :param button_char: Button's text
         :param row: Button's position on the board: [row][col]
         :param col: Button's position on the board: [row][col]
+        :param font: Button's font
         :return: Newly created button
         """
         button = tki.Button(self._letters_area)
-        button.config(image=self._button_image, text=button_char, width=125, height=140,
+        options = dict(image=self._image('button_bg2'), text=button_char, font=font)
+        button.config(width=self._scaled(BUTTON_WIDTH), height=self._scaled(BUTTON_HEIGHT),
                       compound="center",
                       fg='#000000', highlightbackground="#000000",
-                      highlightcolor="#000000", highlightthickness=0, bd=0)
+                      highlightcolor="#000000", highlightthickness=0, bd=0, **options)
         button.grid(row=row, column=col, rowspan=1,
-                    columnspan=1, pady=20, padx=20)
-        self._buttons[button] = [button_char, (row, col), False]
+                    columnspan=1, pady=self._scaled(BUTTON_PADDING), padx=self._scaled(BUTTON_PADDING))
+        self._board_view.add(button, button_char, row, col, options)
 
         def _on_enter(event: Any):
             # on hover change button pic
-            if not self._buttons[button][2]:
-                button.config(image=self._hover_button_image)
+            if not self._board_view.records[button][2]:
+                self._update_button(button, image=self._image('selected_button'))
 
         def _on_leave(event: Any):
             # reset button pic when hover ends
-            if not self._buttons[button][2]:
-                button.config(image=self._button_image)
+            if not self._board_view.records[button][2]:
+                self._update_button(button, image=self._image('button_bg2'))
 
         button.bind("<Enter>", _on_enter)
         button.bind("<Leave>", _on_leave)
@@ -217,7 +731,7 @@ class BoggleGUI:
         :return: hint button
         """
         button = tki.Button(self._hint_area)
-        button.config(image=self._hint_button_image, text='',
+        button.config(image=self._image('hint_button'), text='',
                       font=(MAIN_FONT, 40, 'bold'), width=80, height=70,
                       compound="center",
                       fg='#000000', highlightbackground="#000000",
@@ -225,11 +739,11 @@ class BoggleGUI:
 
         def _on_enter(event: Any):
             # on hover change button pic
-            button.config(image=self._hint_button_hover_image)
+            button.config(image=self._image('hint_button_dark'))
 
         def _on_leave(event: Any):
             # reset button pic when hover ends
-            button.config(image=self._hint_button_image)
+            button.config(image=self._image('hint_button'))
 
         button.bind("<Enter>", _on_enter)
         button.bind("<Leave>", _on_leave)
@@ -243,7 +757,7 @@ class BoggleGUI:
         :return: restart button
         """
         button = tki.Button(self._hint_area)
-        button.config(image=self._restart_button_image, text='',
+        button.config(image=self._image('restart_button'), text='',
                       font=(MAIN_FONT, 40, 'bold'), width=80, height=70,
                       compound="center",
                       fg='#000000', highlightbackground="#000000",
@@ -251,11 +765,11 @@ class BoggleGUI:
 
         def _on_enter(event: Any):
             # on hover change button pic
-            button.config(image=self._restart_button_image_hover)
+            button.config(image=self._image('restart_button_dark'))
 
         def _on_leave(event: Any):
             # reset button pic when hover ends
-            button.config(image=self._restart_button_image)
+            button.config(image=self._image('restart_button'))
 
         button.bind("<Enter>", _on_enter)
         button.bind("<Leave>", _on_leave)
@@ -264,13 +778,25 @@ class BoggleGUI:
         return button
 
     def change_button_text(self, row, col, new_text):
-        self._buttons[(row, col)][1].configure(text=new_text)
+        self._update_button(self._board_view.button((row, col)), text=new_text)
 
-    def change_word_text(self, new_text):
-        self._word_label.config(text=new_text)
+    def change_word_text(self, new_text, dead_end=False):
+        """
+        Change the bottom indicator content
+        :param new_text: current word
+        :param dead_end: if True, no word starts with new_text and it is shown in red
+        :return: None
+        """
+        self._word_label.config(text=new_text, fg=TOP_COLOR if dead_end else RIGHT_SIDE_COLOR)
 
-    def add_guessed_word(self, new_word):
-        self.list_of_words.insert(tki.END, new_word)
+    def add_guessed_word(self, new_word, score=None):
+        """
+        Add a word to the found words panel
+        :param new_word: the word
+        :param score: the score it added, its length to the power of 2 if not given
+        :return: None
+        """
+        self._words_panel.add(new_word, len(new_word) ** 2 if score is None else score)
 
     def update_timer(self, time):
         self._time_label.config(text=time)
@@ -281,85 +807,60 @@ class BoggleGUI:
     def update_hint(self, num):
         self.__hints_attempts_label.config(text='REVEALS: ' + str(num))
 
-    def simulate_button_press(self, button, word):
+    def simulate_button_press(self, button, word, dead_end=False):
         """
         Change the button image on click and change bottom indicator content,
         reset the button image if clicked again
         :param button: a given button
         :param word: current word made by the current path
+        :param dead_end: True if no word starts with the current word
         :return: None
         """
-        if self._buttons[button][2]:
-            button.config(image=self._button_image)
-            self._buttons[button][2] = False
+        record = self._board_view.records[button]
+        if record[2]:
+            self._update_button(button, image=self._image('button_bg2'))
+            record[2] = False
         else:
-            self._buttons[button][2] = True
-            button.config(image=self._selected_button_image)
-        self.change_word_text(word)
+            record[2] = True
+            self._update_button(button, image=self._image('button_clicked'))
+        self.change_word_text(word, dead_end)
 
     def run_animation(self, type, button, time_delay):
         """
-        Create letter buttons animation, calls the __animation_step function
-        :param type: Animation type (success/warning/finished game)
-        :param button: button to animate
+        Create letter buttons animation, run by the animator
+        :param type: Animation type (success/warning/hint/finish)
+        :param button: button to animate, a list of buttons for hint and finish
         :param time_delay: delay between each animation frame
         :return: None
         """
-        if type == 'hint' or type == 'finish':
-            # In this case there are multiple buttons to be animated, number of frames and the buttons' images are saved
-            # onto lists accordingly
-            animation_frames = iter(range(0, len(button) + 1))
-            temp_images = [btn['image'] for btn in button]
-            self.__animation_step(animation_frames, type, button,
-                                  temp_images, time_delay)
+        if type == 'warning':
+            frames = self.__blink_frames(button, self._image('alert_button'), self._board_view.option(button, 'image'))
+        elif type == 'success':
+            frames = self.__blink_frames(button, self._image('success_button'), self._image('button_bg2'))
         else:
-            animation_frames = iter(range(0, 6))
-            self.__animation_step(animation_frames, type, button,
-                                  button['image'], time_delay)
-
-    def __animation_step(self, animation_frames, type, button,
-                         temp_img, time_delay):
-        """
-        Recursive function that stops when the iteration of animation_frames is over
-        Creates different animations based on the given animation type
-        :param animation_frames: number of animation frames
-        :param type: animation type to assign to the button
-        :param button: button to animate
-        :param temp_img: previous button image/images (saved for resetting the button image after the animation is over)
-        :param time_delay: time delay between each animation frame
-        :return: None
+            img = self._image('hint_letter_button' if type == 'hint' else 'success_button')
+            frames = self.__sequence_frames(button, img)
+        self._animator.start(frames, time_delay)
+
+    def __blink_frames(self, button, image, other_image):
         """
-        try:
-            count = next(animation_frames)
-        except StopIteration:
-            return
+        Frames alternating the button image between two images
+        """
+        for count in range(BLINK_FRAMES):
+            self._update_button(button, image=image if count % 2 == 0 else other_image)
+            yield
 
-        try:
-            if type == 'warning':
-                if count % 2 == 0:
-                    button.config(image=self._button_warning)
-                else:
-                    button.config(image=temp_img)
-            elif type == 'success':
-                if count % 2 == 0:
-                    button.config(image=self._button_success)
-                else:
-                    button.config(image=self._button_image)
-            elif type == 'hint' or type == 'finish':
-                if count == len(button):
-                    # If this is the last frame of the animation, reset all the buttons to the default image
-                    for i, btn in enumerate(button):
-                        btn.config(image=temp_img[i])
-                else:
-                    img = self._hint_letter_button if type == 'hint' else self._button_success
-                    button[count].config(image=img)
-
-            self.root.after(time_delay, self.__animation_step, animation_frames,
-                            type, button, temp_img, time_delay)
-        except Exception:
-            # an exception may occur if game restarts during an animation
-            # if so, animation should abort
-            return
+    def __sequence_frames(self, buttons, image):
+        """
+        Frames changing the image of the buttons one by one, then resetting them all to their previous images
+        """
+        temp_images = [self._board_view.option(button, 'image') for button in buttons]
+        for button in buttons:
+            self._update_button(button, image=image)
+            yield
+        for button, temp_image in zip(buttons, temp_images):
+            self._update_button(button, image=temp_image)
+        yield
 
     def add_user_message(self, message, message_time, font_size=15, color='white'):
         """
@@ -373,14 +874,16 @@ class BoggleGUI:
 
         def remove_messaege():
             # inner function to remove the message after a certain delay
+            self.__message_id = None
             self.__user_message_area.config(text='', font=('Arial', 15, 'bold'))
 
-        self.root.after(message_time, remove_messaege)
+        # a new message replaces the previous one, along with its removal timer
+        if self.__message_id is not None:
+            self.root.after_cancel(self.__message_id)
+        self.__message_id = self.root.after(message_time, remove_messaege)
 
     def get_button_from_coordinate(self, coordinate):
-        list_of_buttons = [key for key, value in self._buttons.items() if
-                           coordinate == value[1]]
-        return list_of_buttons[0]
+        return self._board_view.button(coordinate)
 
     def game_over(self, score):
         """
@@ -391,29 +894,31 @@ class BoggleGUI:
         """
         temp_score = score
         text_message = 'GAMEOVER'
+        buttons = self._board_view.buttons()
         all_message_buttons = []
-        for i, button in enumerate(self._buttons):
+        for i, button in enumerate(buttons):
             # divide the game over message between buttons
             if i < len(text_message):
-                button.config(text=text_message[i], image=self._hint_letter_button)
+                self._update_button(button, text=text_message[i], image=self._image('hint_letter_button'))
                 all_message_buttons.append(button)
             else:
-                button.config(text='')
+                self._update_button(button, text='')
             # remove buttons functionality
-            button.config(command=tki.NONE)
+            self._update_button(button, command=tki.NONE)
             button.unbind("<Enter>")
             button.unbind("<Leave>")
         all_score_buttons = []
-        for i in range(len(self._buttons) - 1,
-                       len(self._buttons) - len(temp_score) - 1, -1):
+        for i in range(len(buttons) - 1,
+                       len(buttons) - len(temp_score) - 1, -1):
             # divide score between letters buttons based on the score length
-            list(self._buttons.keys())[i].config(text=temp_score[-1], image=self._button_success)
-            all_score_buttons.append(list(self._buttons.keys())[i])
+            self._update_button(buttons[i], text=temp_score[-1], image=self._image('success_button'))
+            all_score_buttons.append(buttons[i])
             temp_score = temp_score[:-1]
         # add 'Score:' to the appropriate button
-        all_score_buttons.append(list(self._buttons.keys())[(len(self._buttons) - len(score) - 1)])
-        list(self._buttons.keys())[(len(self._buttons) - len(score) - 1)].config(text='SCORE:', font=(MAIN_FONT, 14),
-                                                                                 image=self._button_success)
+        score_title_button = buttons[len(buttons) - len(score) - 1]
+        all_score_buttons.append(score_title_button)
+        self._update_button(score_title_button, text='SCORE:', font=(MAIN_FONT, max(self._scaled(SCORE_FONT_SIZE), 7)),
+                            image=self._image('success_button'))
         # reverse the list for the animation
         all_score_buttons = list(reversed(all_score_buttons))
         # run animations
@@ -435,8 +940,7 @@ class BoggleGUI:
         self.__hints_attempts_label.pack(side=tki.TOP, fill=tki.BOTH)
         self.__user_message_area.pack(side=tki.TOP, fill=tki.BOTH)
         self._guessed_words_label.pack(side=tki.TOP, fill=tki.BOTH)
-        self.list_of_words.pack(padx=5, side=tki.LEFT, fill=tki.BOTH)
-        self._scrollbar.pack(side=tki.RIGHT, fill=tki.BOTH)
+        self._words_panel.frame.pack(side=tki.TOP, fill=tki.BOTH, expand=True)
         self._letters_area.pack(side=tki.TOP)
         self._word_area.pack(side=tki.BOTTOM, fill=tki.BOTH, expand=True)
 
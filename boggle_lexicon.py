@@ -0,0 +1,507 @@
+import abc
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+
+import boggle_board_randomizer as randomizer
+import boggle_profile as profile
+
+WORD_END = ''  # key marking a node on which a word ends
+MIN_WORD_LENGTH = 3  # shorter words are dropped by preprocess_words
+
+# compiled dictionary file layout: a header followed by a table of uint32
+# edges. The edges going out of a node are stored contiguously, sorted by
+# char, and a node is referred to by the index of its first edge (0 for a
+# node without edges). Each edge packs:
+#   bits 0-7    the char (latin-1)
+#   bit 8       set on the last edge of a node
+#   bit 9       set if a word ends on the target node
+#   bits 10-31  index of the first edge of the target node
+PACKED_MAGIC = b'BOGDAWG1'
+PACKED_HEADER = struct.Struct('<8sIII')  # magic, edge count, word count, root
+COMPILED_SUFFIX = '.dawg'
+_CHAR_MASK = 0xFF
+_LAST_EDGE = 1 << 8
+_WORD_EDGE = 1 << 9
+_TARGET_SHIFT = 10
+_MAX_EDGES = 1 << (32 - _TARGET_SHIFT)
+
+# lexicons loaded by load_lexicon: absolute path -> (file signatures, lexicon)
+_lexicon_cache = {}
+_cache_lock = threading.Lock()
+
+
+class BaseLexicon(abc.ABC):
+    """
+    Common interface of the lexicon implementations. A lexicon is walked
+    node by node, what a node is depends on the implementation; the solvers
+    only use root, child() and is_word().
+    """
+    root = None
+
+    @abc.abstractmethod
+    def child(self, node, char):
+        """
+        :param node: a node of the lexicon
+        :param char: a single character
+        :return: the node reached from node by char, None if there's none
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def is_word(self, node):
+        """
+        :return: True if a word ends on the given node
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def edges(self, node):
+        """
+        :return: iterator of (char, child node) pairs going out of node, in
+        alphabetical order
+        """
+        raise NotImplementedError
+
+    def node_id(self, node):
+        """
+        :return: a hashable id of node, equal for the same node
+        """
+        return id(node)
+
+    def walk(self, node, string):
+        """
+        Follow every character of string starting at node
+        :param node: a node of the lexicon
+        :param string: characters to follow, may be longer than one char (QU)
+        :return: the node reached, None if string leaves the lexicon
+        """
+        for char in string:
+            node = self.child(node, char)
+            if node is None:
+                return None
+        return node
+
+    def has_prefix(self, prefix):
+        """
+        :return: True if at least one word starts with prefix
+        """
+        return self.walk(self.root, prefix) is not None
+
+    def __contains__(self, word):
+        node = self.walk(self.root, word)
+        return node is not None and self.is_word(node)
+
+    def __iter__(self):
+        """
+        Yield all the words in alphabetical order
+        """
+        stack = [(self.root, '')]
+        while stack:
+            node, prefix = stack.pop()
+            if self.is_word(node):
+                yield prefix
+            for char, child in reversed(list(self.edges(node))):
+                stack.append((child, prefix + char))
+
+
+class Lexicon(BaseLexicon):
+    """
+    Immutable word dictionary stored as a minimized DAWG (directed acyclic
+    word graph). Each node is a dict mapping a character to the next node,
+    a node on which a word ends also holds the WORD_END key.
+    Equal suffixes are shared between words, so the graph is much smaller
+    than a plain trie or a set of all the prefixes.
+    """
+
+    def __init__(self, words):
+        """
+        Build the DAWG from the given words
+        :param words: iterable of words (a list, a set, the keys of a dict...)
+        """
+        self.root = {}
+        self.__size = 0
+        self.__register = {}
+        previous_word = ''
+        for word in sorted(set(words)):
+            common = 0
+            for a, b in zip(previous_word, word):
+                if a != b:
+                    break
+                common += 1
+            node = self.root
+            for char in word[:common]:
+                node = node[char]
+            self.__replace_or_register(node)
+            for char in word[common:]:
+                node[char] = {}
+                node = node[char]
+            node[WORD_END] = True
+            self.__size += 1
+            previous_word = word
+        self.__replace_or_register(self.root)
+        # the register is only needed while building
+        del self.__register
+
+    def __replace_or_register(self, node):
+        """
+        Minimize the most recently added branch below the given node, by
+        replacing each of its nodes with an equivalent registered node
+        :param node: a node whose last child branch is complete
+        """
+        stack = []
+        while True:
+            last_char = next(reversed(node), WORD_END)
+            if last_char == WORD_END:
+                break
+            stack.append((node, last_char))
+            node = node[last_char]
+        for parent, char in reversed(stack):
+            child = parent[char]
+            signature = tuple((key, id(value)) for key, value in child.items())
+            registered = self.__register.get(signature)
+            if registered is None:
+                self.__register[signature] = child
+            else:
+                parent[char] = registered
+
+    def child(self, node, char):
+        return node.get(char)
+
+    def is_word(self, node):
+        return WORD_END in node
+
+    def __len__(self):
+        return self.__size
+
+    def edges(self, node):
+        for char, child in node.items():
+            if char != WORD_END:
+                yield char, child
+
+
+class PackedLexicon(BaseLexicon):
+    """
+    Lexicon read from a compiled dictionary file (see compile_lexicon).
+    The file is memory-mapped and walked in place, so loading it costs no
+    parsing, and every process reading the same file shares its pages.
+    A node is an int: the index of its first edge shifted left by one, with
+    the low bit set if a word ends on it.
+    """
+
+    def __init__(self, file_path):
+        """
+        :param file_path: path of a compiled dictionary file
+        """
+        with open(file_path, 'rb') as packed_file:
+            self.__mmap = mmap.mmap(packed_file.fileno(), 0,
+                                    access=mmap.ACCESS_READ)
+        magic, edge_count, self.__size, root = \
+            PACKED_HEADER.unpack_from(self.__mmap)
+        if magic != PACKED_MAGIC:
+            raise ValueError(file_path + ' is not a compiled dictionary')
+        if sys.byteorder != 'little':
+            raise ValueError('compiled dictionaries need a little-endian host')
+        self.__edges = memoryview(self.__mmap)[
+            PACKED_HEADER.size:PACKED_HEADER.size + 4 * edge_count].cast('I')
+        self.root = root << 1
+
+    def child(self, node, char):
+        edges = self.__edges
+        i = node >> 1
+        if not i:
+            return None
+        char = ord(char)
+        while True:
+            edge = edges[i]
+            edge_char = edge & _CHAR_MASK
+            if edge_char == char:
+                return (edge >> _TARGET_SHIFT << 1) | \
+                       (1 if edge & _WORD_EDGE else 0)
+            # edges are sorted, so the char can't appear after a greater one
+            if edge_char > char or edge & _LAST_EDGE:
+                return None
+            i += 1
+
+    def is_word(self, node):
+        return node & 1 == 1
+
+    def node_id(self, node):
+        return node
+
+    def edges(self, node):
+        edges = self.__edges
+        i = node >> 1
+        while i:
+            edge = edges[i]
+            yield chr(edge & _CHAR_MASK), (edge >> _TARGET_SHIFT << 1) | \
+                (1 if edge & _WORD_EDGE else 0)
+            i = 0 if edge & _LAST_EDGE else i + 1
+
+    def __len__(self):
+        return self.__size
+
+
+def compile_lexicon(lexicon, file_path):
+    """
+    Write a lexicon to a compiled dictionary file, readable by PackedLexicon
+    :param lexicon: a Lexicon or a PackedLexicon
+    :param file_path: path of the file to write
+    :return: number of edges written
+    """
+    # give each distinct node a contiguous block of edges, index 0 is unused
+    # so that it can stand for "no edges"
+    # nodes are keyed by node_id: the int nodes of a PackedLexicon are
+    # created on the fly, their id() may be reused
+    node_id = lexicon.node_id
+    first_edge = {}
+    order = []
+    next_edge = 1
+    stack = [lexicon.root]
+    while stack:
+        node = stack.pop()
+        if node_id(node) in first_edge:
+            continue
+        out_edges = list(lexicon.edges(node))
+        if out_edges:
+            first_edge[node_id(node)] = next_edge
+            next_edge += len(out_edges)
+            order.append(out_edges)
+        else:
+            first_edge[node_id(node)] = 0
+        stack.extend(child for char, child in out_edges)
+    if next_edge > _MAX_EDGES:
+        raise ValueError('dictionary is too large to compile')
+
+    table = [0] * next_edge
+    i = 1
+    for out_edges in order:
+        for j, (char, child) in enumerate(out_edges):
+            if ord(char) > _CHAR_MASK:
+                raise ValueError('can not compile the char ' + repr(char))
+            edge = ord(char) | first_edge[node_id(child)] << _TARGET_SHIFT
+            if lexicon.is_word(child):
+                edge |= _WORD_EDGE
+            if j == len(out_edges) - 1:
+                edge |= _LAST_EDGE
+            table[i] = edge
+            i += 1
+
+    with open(file_path, 'wb') as packed_file:
+        root = first_edge[node_id(lexicon.root)]
+        packed_file.write(PACKED_HEADER.pack(PACKED_MAGIC, len(table),
+                                             len(lexicon), root))
+        packed_file.write(struct.pack('<%dI' % len(table), *table))
+    return len(table)
+
+
+def tokenize(word, tiles):
+    """
+    Split a word into the tiles spelling it, the longest tile first: with a
+    QU tile, QU is a single tile and a Q must be followed by a U
+    :param word: the word
+    :param tiles: set of the tiles of the dice
+    :return: list of the tiles, None if the tiles can't spell the word
+    """
+    longest = max(len(tile) for tile in tiles)
+    result = []
+    i = 0
+    while i < len(word):
+        for length in range(min(longest, len(word) - i), 0, -1):
+            if word[i:i + length] in tiles:
+                result.append(word[i:i + length])
+                i += length
+                break
+        else:
+            return None
+    return result
+
+
+def preprocess_words(lines, tiles, min_length=MIN_WORD_LENGTH,
+                     max_tiles=None, rejected=None):
+    """
+    Normalize and filter the lines of a word list, one at a time: the words
+    are stripped and upper cased, and only the words the dice can spell
+    are kept
+    :param lines: iterable of lines, one word per line
+    :param tiles: set of the tiles of the dice
+    :param min_length: words with fewer letters are dropped
+    :param max_tiles: words with more tiles (the cells of the board) are
+    dropped, no limit if None
+    :param rejected: if given, a dict counting the dropped words per reason
+    ('characters', 'tiles', 'short' or 'long')
+    :return: iterator of the kept words
+    """
+    for line in lines:
+        word = line.strip().upper()
+        if not word:
+            continue
+        if not word.isalpha():
+            reason = 'characters'
+        elif len(word) < min_length:
+            reason = 'short'
+        else:
+            word_tiles = tokenize(word, tiles)
+            if word_tiles is None:
+                reason = 'tiles'
+            elif max_tiles is not None and len(word_tiles) > max_tiles:
+                reason = 'long'
+            else:
+                yield word
+                continue
+        if rejected is not None:
+            rejected[reason] = rejected.get(reason, 0) + 1
+
+
+def compiled_path(file_path):
+    """
+    :return: path of the compiled dictionary matching a words file
+    """
+    return os.path.splitext(file_path)[0] + COMPILED_SUFFIX
+
+
+def _file_signature(file_path):
+    """
+    :return: (modification time, size) of a file, None if it doesn't exist
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_lexicon(file_path):
+    """
+    Read a lexicon from a file, without going through the cache
+    """
+    with open(file_path, 'rb') as word_file:
+        is_compiled = word_file.read(len(PACKED_MAGIC)) == PACKED_MAGIC
+    if is_compiled:
+        return PackedLexicon(file_path)
+
+    packed_path = compiled_path(file_path)
+    if os.path.exists(packed_path) and \
+            os.path.getmtime(packed_path) >= os.path.getmtime(file_path):
+        return PackedLexicon(packed_path)
+
+    with open(file_path, 'r') as word_file:
+        return Lexicon(line.strip() for line in word_file if line.strip())
+
+
+@profile.timed('load_lexicon')
+def load_lexicon(file_path):
+    """
+    Load a lexicon from a file. A compiled dictionary is memory-mapped. For a
+    words file (one word per line), its compiled version is used instead when
+    there's one which is up to date, otherwise the words are read and a
+    Lexicon is built.
+    Lexicons are immutable, so each one is loaded once per process and
+    cached; the cached lexicon is dropped when the file (or its compiled
+    version) is modified.
+    :param file_path: path of a words file or of a compiled dictionary
+    :return: a lexicon
+    """
+    key = os.path.abspath(file_path)
+    signature = _cache_signature(key)
+    with _cache_lock:
+        cached = _lexicon_cache.get(key)
+        if cached is None or cached[0] != signature:
+            profile.count('lexicon_cache.misses')
+            cached = signature, _read_lexicon(file_path)
+            _lexicon_cache[key] = cached
+        else:
+            profile.count('lexicon_cache.hits')
+        return cached[1]
+
+
+def _cache_signature(key):
+    """
+    :return: signature of a cached lexicon, it's dropped when it changes
+    """
+    return _file_signature(key), _file_signature(compiled_path(key))
+
+
+def cached_lexicon(file_path):
+    """
+    :param file_path: path of a words file or of a compiled dictionary
+    :return: its lexicon if it's cached and the file wasn't modified since,
+    None otherwise
+    """
+    key = os.path.abspath(file_path)
+    signature = _cache_signature(key)
+    with _cache_lock:
+        cached = _lexicon_cache.get(key)
+    if cached is None or cached[0] != signature:
+        return None
+    return cached[1]
+
+
+def clear_lexicon_cache():
+    """
+    Drop every cached lexicon
+    """
+    with _cache_lock:
+        _lexicon_cache.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Boggle dictionary tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+    compile_parser = commands.add_parser(
+        'compile-dict', help='compile a words file for fast loading')
+    compile_parser.add_argument('source', nargs='?', default='boggle_dict.txt',
+                                help='words file, one word per line')
+    compile_parser.add_argument('target', nargs='?',
+                                help='compiled file (default: source with a '
+                                     + COMPILED_SUFFIX + ' suffix)')
+    preprocess_parser = commands.add_parser(
+        'preprocess', help='filter a words file for a dice set and compile '
+                           'the words which can be played')
+    preprocess_parser.add_argument('source', help='words file, one word per '
+                                                  'line (UTF-8)')
+    preprocess_parser.add_argument('target', nargs='?',
+                                   help='compiled file (default: source '
+                                        'with a ' + COMPILED_SUFFIX +
+                                        ' suffix)')
+    preprocess_parser.add_argument('--min-length', type=int,
+                                   default=MIN_WORD_LENGTH,
+                                   help='drop shorter words (default: %d)'
+                                        % MIN_WORD_LENGTH)
+    preprocess_parser.add_argument('--size', type=int, default=4,
+                                   help='board size of the dice set '
+                                        '(default: 4)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'preprocess':
+        if args.size not in randomizer.DICE_SETS:
+            parser.error('no dice set for size %d' % args.size)
+        tiles = {face for die in randomizer.DICE_SETS[args.size]
+                 for face in die}
+        target = args.target or compiled_path(args.source)
+        rejected = dict()
+        with open(args.source, 'r', encoding='utf-8') as word_file:
+            lexicon = Lexicon(preprocess_words(word_file, tiles,
+                                               args.min_length,
+                                               args.size ** 2, rejected))
+        compile_lexicon(lexicon, target)
+        print('kept %d words into %s, dropped %s'
+              % (len(lexicon), target,
+                 ', '.join('%d (%s)' % (count, reason) for reason, count
+                           in sorted(rejected.items())) or 'none'))
+
+    if args.command == 'compile-dict':
+        target = args.target or compiled_path(args.source)
+        with open(args.source, 'r') as word_file:
+            lexicon = Lexicon(line.strip() for line in word_file
+                              if line.strip())
+        edge_count = compile_lexicon(lexicon, target)
+        print('compiled %d words (%d edges) into %s'
+              % (len(lexicon), edge_count, target))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Opt-in instrumentation of the hot paths: counters and timing histograms.
+
+Profiling is off unless the BOGGLE_PROFILE environment variable is set (or
+enable() is called, e.g. by `python boggle.py --profile`). While it's off,
+an instrumented call costs a single check of the flag. While it's on, the
+stats are printed to stderr when the process exits.
+"""
+import atexit
+import bisect
+import functools
+import os
+import sys
+import threading
+import time
+
+ENV_VAR = 'BOGGLE_PROFILE'
+# upper bounds of the histogram buckets in ms, the last bucket is unbounded
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+enabled = False
+_counters = dict()
+_histograms = dict()
+_lock = threading.Lock()
+_dump_registered = False
+
+
+class Histogram:
+    """
+    Timings bucketed by BUCKETS_MS
+    """
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0  # ms
+        self.max = 0.0  # ms
+
+    def add(self, ms):
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, p):
+        """
+        :return: upper bound of the bucket holding the p-th percentile, at
+        most the max
+        """
+        rank = p / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) \
+                    else self.max
+        return self.max
+
+    def summary(self):
+        return {'count': self.count, 'mean_ms': self.total / self.count,
+                'p50_ms': self.percentile(50), 'p99_ms': self.percentile(99),
+                'max_ms': self.max}
+
+
+def enable(on=True):
+    """
+    Turn profiling on (or off), the stats are dumped when the process exits
+    """
+    global enabled, _dump_registered
+    enabled = on
+    if on and not _dump_registered:
+        atexit.register(dump)
+        _dump_registered = True
+
+
+def count(name, n=1):
+    """
+    Add n to a counter
+    """
+    if enabled:
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + n
+
+
+def record(name, seconds):
+    """
+    Add a timing to a histogram
+    """
+    if enabled:
+        with _lock:
+            if name not in _histograms:
+                _histograms[name] = Histogram()
+            _histograms[name].add(seconds * 1000)
+
+
+def timed(name):
+    """
+    Decorator recording the duration of each call of a function
+    :param name: name of the histogram
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def stats():
+    """
+    :return: dict of the counters and of the summaries of the histograms
+    """
+    with _lock:
+        return {'counters': dict(_counters),
+                'timings': {name: histogram.summary()
+                            for name, histogram in _histograms.items()}}
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def format_stats():
+    """
+    :return: the stats as a text table
+    """
+    current = stats()
+    lines = ['%-28s%8s%10s%10s%10s%10s'
+             % ('timing', 'count', 'mean_ms', 'p50_ms', 'p99_ms', 'max_ms')]
+    for name, summary in sorted(current['timings'].items()):
+        lines.append('%-28s%8d%10.3f%10.3f%10.3f%10.3f'
+                     % (name, summary['count'], summary['mean_ms'],
+                        summary['p50_ms'], summary['p99_ms'],
+                        summary['max_ms']))
+    lines.append('%-28s%8s' % ('counter', 'value'))
+    for name, value in sorted(current['counters'].items()):
+        lines.append('%-28s%8d' % (name, value))
+    return '\n'.join(lines)
+
+
+def dump(file=None):
+    print(format_stats(), file=file or sys.stderr)
+
+
+if os.environ.get(ENV_VAR):
+    enable()
@@ -0,0 +1,196 @@
+"""
+Headless Boggle server: many game sessions in one process, played over a
+TCP or unix socket with one JSON object per line.
+
+Requests (each may carry an "id", echoed in the response):
+    {"cmd": "new", "size": 4, "hints": "shortest"}  -> session id and board
+                                                       (size 4, 5 or 6, hints "shortest" or "best",
+                                                       the defaults if not given)
+    {"cmd": "start", "session": ID}                 -> starts the countdown
+    {"cmd": "select", "session": ID, "cell": [row, col]}
+    {"cmd": "hint", "session": ID}
+    {"cmd": "state", "session": ID}
+    {"cmd": "close", "session": ID}
+    {"cmd": "stats"}                                -> profiling stats (see boggle_profile)
+When the time of a session is up, the server sends
+    {"event": "game_over", "session": ID, "score": SCORE}
+
+Run with `python3 boggle_server.py [--port PORT | --unix PATH]`.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+from concurrent.futures import TimeoutError
+
+import boggle_board_randomizer as randomizer
+import boggle_lexicon as lexicons
+import boggle_profile as profile
+import boggle_session as session
+
+DEFAULT_PORT = 8765
+
+
+class BoggleServer:
+    """
+    Serves sessions sharing one lexicon and one background solver. A single
+    clock task counts down every running session, instead of a timer per game.
+    """
+
+    def __init__(self, lexicon):
+        """
+        :param lexicon: words lexicon shared by all the sessions
+        """
+        self.lexicon = lexicon
+        self.__sessions = dict()  # session id -> (session, writer of its client)
+        self.__running = set()  # ids of the started sessions which aren't over
+        self.__ids = itertools.count(1)
+
+    @property
+    def sessions_count(self):
+        return len(self.__sessions)
+
+    @staticmethod
+    def __send(writer, message):
+        writer.write((json.dumps(message) + '\n').encode())
+
+    async def run_clock(self):
+        """
+        Count down every running session once a second
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + 1
+        while True:
+            # sleep until the next whole second, so the clock doesn't drift
+            await asyncio.sleep(max(next_tick - loop.time(), 0))
+            next_tick += 1
+            for session_id in list(self.__running):
+                game, writer = self.__sessions[session_id]
+                game.tick()
+                if game.is_over:
+                    self.__running.discard(session_id)
+                    self.__send(writer, {'event': 'game_over', 'session': session_id, 'score': game.score})
+
+    async def handle_client(self, reader, writer):
+        """
+        Serve the requests of one client, its sessions are closed when it disconnects
+        """
+        owned = set()
+        try:
+            async for line in reader:
+                request = {}
+                try:
+                    request = json.loads(line)
+                    response = await self.handle_request(request, writer, owned)
+                except (ValueError, KeyError, TypeError, IndexError) as error:
+                    response = {'ok': False, 'error': str(error)}
+                if isinstance(request, dict) and 'id' in request:
+                    response['id'] = request['id']
+                self.__send(writer, response)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                self.__close(session_id)
+            writer.close()
+
+    def __close(self, session_id):
+        game, _ = self.__sessions.pop(session_id, (None, None))
+        if game is not None:
+            game.cancel()
+        self.__running.discard(session_id)
+
+    @staticmethod
+    def __state(game):
+        return {'score': game.score, 'max_score': game.max_score, 'time_left': game.time_left,
+                'hints': game.hint_attempts,
+                'path': game.path, 'word': game.word,
+                'dead_end': game.dead_end, 'found': sorted(game.found_words)}
+
+    async def handle_request(self, request, writer, owned):
+        """
+        :param request: dict of the request
+        :param writer: writer of the client
+        :param owned: ids of the sessions of the client
+        :return: dict of the response
+        """
+        command = request['cmd']
+        if command == 'new':
+            board = randomizer.randomize_board(randomizer.DICE_SETS[request.get('size', randomizer.BOARD_SIZE)])
+            session_id = next(self.__ids)
+            game = session.GameSession(board, self.lexicon, hint_mode=request.get('hints', session.SHORTEST))
+            self.__sessions[session_id] = (game, writer)
+            owned.add(session_id)
+            return {'ok': True, 'session': session_id, 'board': board}
+        if command == 'stats':
+            return dict(profile.stats(), ok=True, enabled=profile.enabled)
+
+        session_id = request['session']
+        if session_id not in owned:
+            raise KeyError('unknown session %r' % session_id)
+        game = self.__sessions[session_id][0]
+        if command == 'start':
+            game.start()
+            self.__running.add(session_id)
+            return {'ok': True, 'time_left': game.time_left}
+        if command == 'select':
+            move = game.select(tuple(request['cell']))
+        elif command == 'hint':
+            search = game.hint_in_background()
+            if not search.done():
+                # the board isn't solved yet, don't block the other sessions while it's searched
+                try:
+                    await asyncio.wrap_future(search)
+                except TimeoutError:
+                    pass  # answered by use_hint
+            move = game.use_hint(search)
+        elif command == 'state':
+            return dict(self.__state(game), ok=True)
+        elif command == 'close':
+            owned.discard(session_id)
+            self.__close(session_id)
+            return {'ok': True}
+        else:
+            raise ValueError('unknown command %r' % command)
+        return dict(self.__state(game), ok=True, result=move.result, move_path=move.path,
+                    move_word=move.word, added_score=move.score)
+
+
+async def serve(lexicon, host='127.0.0.1', port=DEFAULT_PORT, unix_path=None):
+    """
+    Run a server until cancelled
+    """
+    server = BoggleServer(lexicon)
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle_client, unix_path)
+    else:
+        listener = await asyncio.start_server(server.handle_client, host, port)
+    clock = asyncio.ensure_future(server.run_clock())
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        clock.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Headless Boggle server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--unix', metavar='PATH', help='listen on a unix socket instead of TCP')
+    parser.add_argument('--dict', default='boggle_dict.txt', help='dictionary file, words or compiled')
+    parser.add_argument('--profile', action='store_true',
+                        help='time the hot paths, see the stats command (or set ' + profile.ENV_VAR + ')')
+    args = parser.parse_args(argv)
+    if args.profile:
+        profile.enable()
+    lexicon = lexicons.load_lexicon(args.dict)
+    try:
+        asyncio.run(serve(lexicon, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
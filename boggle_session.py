@@ -0,0 +1,358 @@
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+
+import boggle_lexicon as lexicons
+import boggle_profile as profile
+import ex12_utils as utils
+
+INITIAL_TIME = 180  # initial time in seconds
+HINT_ATTEMPTS = 3
+HINT_BUDGET = 0.02  # seconds a hint may search the board while it isn't solved
+
+# hint modes
+SHORTEST = 'shortest'  # the shortest word continuing the path
+BEST = 'best'  # the word continuing the path with the highest score
+HINT_MODES = (SHORTEST, BEST)
+
+# results of a move
+SELECTED = 'selected'  # the cell was added to the path
+WORD_FOUND = 'word_found'  # the cell completed a new word, the path is cleared
+NOT_NEIGHBOR = 'not_neighbor'  # the cell isn't next to the last cell of the path
+DESELECTED = 'deselected'  # the last cell of the path was removed
+NOT_LAST = 'not_last'  # the cell is in the path but isn't its last cell
+INVALID_CELL = 'invalid_cell'  # the coordinate isn't of a cell of the board
+HINT = 'hint'  # path holds a word continuing the current path
+NO_MATCH = 'no_match'  # no word that wasn't found yet continues the path
+NO_HINTS_LEFT = 'no_hints_left'
+HINT_PENDING = 'hint_pending'  # the board isn't solved yet and its search didn't end in time, no hint attempt was used
+NOT_STARTED = 'not_started'
+GAME_OVER = 'game_over'
+
+# result: one of the results above, path: the path of the move (the path of
+# the word for WORD_FOUND and HINT), word: its word, score: the score added
+Move = namedtuple('Move', ['result', 'path', 'word', 'score'])
+
+# worker thread loading dictionaries and solving new boards in the background, shared by all the sessions. Its
+# futures are cancelled when their board is replaced, so a stale board doesn't hold up the next one.
+_solver_executor = ThreadPoolExecutor(max_workers=1)
+# worker thread searching the hints of boards which aren't solved yet, so that they never wait behind the solving of
+# other boards; a search takes at most HINT_BUDGET
+_hint_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def load_in_background(dict_path):
+    """
+    :param dict_path: path of a words file or of a compiled dictionary
+    :return: future of its lexicon, boards submitted afterwards are solved once it's loaded
+    """
+    return _solver_executor.submit(lexicons.load_lexicon, dict_path)
+
+
+def solve_in_background(board, lexicon):
+    """
+    :return: future of the SolutionIndex of the board
+    """
+    return _solver_executor.submit(utils.SolutionIndex, board, lexicon)
+
+
+class HintService:
+    """
+    Hints of a game: the words which weren't found yet continuing a path.
+    The completions of a path are ranked once and kept for the rest of the
+    game; as found words are never lost, later hints on the same path resume
+    from the last answer. Until the board is solved, hints search it directly,
+    for at most the budget.
+    """
+
+    def __init__(self, board, lexicon, solution_index, mode=SHORTEST, budget=HINT_BUDGET):
+        """
+        :param board: board list
+        :param lexicon: words lexicon
+        :param solution_index: future of the SolutionIndex of the board
+        :param mode: SHORTEST or BEST
+        :param budget: seconds a hint may search the board while the solution index isn't ready
+        """
+        if mode not in HINT_MODES:
+            raise ValueError('unknown hint mode %r' % mode)
+        self.mode = mode
+        self.board = board
+        self.__lexicon = lexicon
+        self.__solution_index = solution_index
+        self.__budget = budget
+        # path -> [(word, path)... of the completions in the order of the mode, position of the last answer]
+        self.__ranked = dict()
+
+    def __rank(self, solution_index, path):
+        completions = solution_index.completions(path)
+        if self.mode == BEST:
+            # the score of a word is the length of its path to the power of 2
+            completions = sorted(completions, key=lambda completion: -len(completion[1]))
+        return completions
+
+    def __search(self, path, found_words):
+        """
+        Search the board for the hint, within the budget. The shortest hint is searched by increasing path length, so
+        the first path found is the answer; the best hint needs the longest path, so the whole board is searched.
+        :return: path of the hint, None if there's none
+        :raise TimeoutError: if the budget was spent before the search ended
+        """
+        deadline = time.perf_counter() + self.__budget
+        cells = len(self.board) ** 2
+        try:
+            if self.mode == SHORTEST:
+                for length in range(len(path) + 1, cells + 1):
+                    for completion in utils.iter_paths(self.board, self.__lexicon, length, path, found_words,
+                                                       deadline):
+                        return completion
+                return None
+            return max(utils.iter_paths(self.board, self.__lexicon, None, path, found_words, deadline),
+                       key=len, default=None)
+        except TimeoutError:
+            profile.count('hint.timeouts')
+            raise
+
+    @profile.timed('hint')
+    def hint(self, path, found_words):
+        """
+        :param path: list of coordinates
+        :param found_words: words that were found, skipped
+        :return: path of the hint, None if no word that wasn't found continues the path
+        :raise TimeoutError: if the board isn't solved and the budget was spent before the search ended
+        """
+        key = tuple(path)
+        ranked = self.__ranked.get(key)
+        if ranked is None:
+            if not self.__lexicon.has_prefix(''.join(self.board[i][j] for i, j in path)):
+                # no word starts with the path, no need for the solution index
+                ranked = self.__ranked[key] = [[], 0]
+            else:
+                if not self.__solution_index.done() or self.__solution_index.cancelled():
+                    # the board isn't solved yet (or won't be), the answer isn't kept
+                    profile.count('hint.searches')
+                    return self.__search(path, found_words)
+                profile.count('hint.ranked')
+                ranked = self.__ranked[key] = [self.__rank(self.__solution_index.result(), path), 0]
+        else:
+            profile.count('hint.memo_hits')
+        completions, position = ranked
+        while position < len(completions) and completions[position][0] in found_words:
+            position += 1
+        ranked[1] = position
+        return completions[position][1] if position < len(completions) else None
+
+
+class GameSession:
+    """
+    The rules of a single Boggle game, with no user interface: building the
+    path, scoring the words, hints and the countdown. The countdown doesn't
+    run by itself, whoever drives the session calls tick() every second.
+    """
+
+    def __init__(self, board, lexicon, solution_index=None, hint_mode=SHORTEST):
+        """
+        :param board: board list
+        :param lexicon: words lexicon, may be shared by many sessions
+        :param solution_index: future of the SolutionIndex of the board, it is
+        started in the background if not given
+        :param hint_mode: SHORTEST or BEST, the word given by hints
+        """
+        # checked before the board is submitted for solving
+        if hint_mode not in HINT_MODES:
+            raise ValueError('unknown hint mode %r' % hint_mode)
+        self.board = board
+        self.lexicon = lexicon
+        self.solution_index = solution_index or solve_in_background(board, lexicon)
+        self.hints = HintService(board, lexicon, self.solution_index, hint_mode)
+        self.found_words = set()
+        self.score = 0
+        self.hint_attempts = HINT_ATTEMPTS
+        self.time_left = INITIAL_TIME
+        self.started = False
+        self.__path = utils.PathState(board, lexicon)
+
+    @property
+    def path(self):
+        """
+        :return: list of the coordinates of the current path
+        """
+        return self.__path.path
+
+    @property
+    def word(self):
+        return self.__path.word
+
+    @property
+    def dead_end(self):
+        """
+        :return: True if no word starts with the letters of the current path
+        """
+        return self.__path.dead_end
+
+    @property
+    def max_score(self):
+        """
+        :return: the highest score possible on the board, None while the board is being solved
+        """
+        if not self.solution_index.done() or self.solution_index.cancelled():
+            return None
+        return self.solution_index.result().max_score
+
+    @property
+    def is_over(self):
+        return self.started and self.time_left == 0
+
+    def start(self):
+        """
+        Start the game, from now on tick() counts down
+        """
+        self.started = True
+
+    def tick(self):
+        """
+        Count down one second
+        :return: seconds left
+        """
+        if self.started and self.time_left > 0:
+            self.time_left -= 1
+        return self.time_left
+
+    def is_cell(self, coordinate):
+        """
+        :param coordinate: (row, col), a tuple or a list
+        :return: True if it's the coordinate of a cell of the board
+        """
+        # bool is a subclass of int, but True isn't a row
+        return isinstance(coordinate, (tuple, list)) and len(coordinate) == 2 and \
+            all(type(index) is int and 0 <= index < len(self.board) for index in coordinate)
+
+    def check_if_neighbor(self, coordinate):
+        """
+        Check if a given coordinate is a neighbor of the last coordinate in the current path
+        :param coordinate: given coordinate
+        :return: True if neighbor, False otherwise
+        """
+        if len(self.path) == 0:
+            return True
+        last_path_coordinate = self.path[-1]
+        if last_path_coordinate != coordinate and not (
+                abs(last_path_coordinate[0] - coordinate[0]) > 1 or
+                abs((last_path_coordinate[1] - coordinate[1])) > 1):
+            return True
+        return False
+
+    def __move(self, result, path=None, word=None, score=0):
+        return Move(result, list(self.path) if path is None else path,
+                    self.word if word is None else word, score)
+
+    @profile.timed('select')
+    def select(self, coordinate):
+        """
+        Play a cell: add it to the path, or remove it if it's the last cell of the path
+        :param coordinate: (row, col) of the cell
+        :return: the Move played
+        """
+        if not self.started:
+            return self.__move(NOT_STARTED)
+        if self.is_over:
+            return self.__move(GAME_OVER)
+        if not self.is_cell(coordinate):
+            return self.__move(INVALID_CELL)
+        coordinate = tuple(coordinate)
+
+        if coordinate in self.__path:
+            if coordinate != self.path[-1]:
+                return self.__move(NOT_LAST)
+            self.__path.pop()
+            return self.__move(DESELECTED)
+
+        if not self.check_if_neighbor(coordinate):
+            return self.__move(NOT_NEIGHBOR)
+        self.__path.push(coordinate)
+        if not self.__path.is_word or self.word in self.found_words:
+            return self.__move(SELECTED)
+
+        # a new word: score it, the score is the path length to the power of 2, and start a new path
+        added_score = len(self.path) ** 2
+        self.score += added_score
+        self.found_words.add(self.word)
+        move = self.__move(WORD_FOUND, score=added_score)
+        self.__path.clear()
+        return move
+
+    def hint(self):
+        """
+        Find the path of a word that wasn't found yet and that continues the current path (the shortest or the best
+        one, depending on the hint mode), using one hint attempt if there's one
+        :return: the Move, with the path of the hint for a HINT result
+        """
+        refused = self.__refuse_hint()
+        if refused:
+            return refused
+        try:
+            path = self.hints.hint(self.path, self.found_words)
+        except TimeoutError:
+            # the index is normally ready long before the first hint
+            return self.__move(HINT_PENDING)
+        return self.__use_hint(path)
+
+    def hint_in_background(self):
+        """
+        Search the hint of the current path without blocking the caller. Once the board is solved the hint is a
+        lookup, answered at once; until then it's searched on the hint thread, with copies of the path and the found
+        words, the session may keep being played meanwhile.
+        :return: future of the path of the hint (None if there's none), to be passed to use_hint() once done, it
+        raises TimeoutError if the board isn't solved and the search didn't end within the budget
+        """
+        search = Future()
+        if self.__refuse_hint():
+            # nothing to search, use_hint() answers why
+            search.set_result(None)
+            return search
+        if self.solution_index.done():
+            try:
+                search.set_result(self.hints.hint(self.path, self.found_words))
+            except TimeoutError as error:
+                # the solving was cancelled, the board was searched
+                search.set_exception(error)
+            return search
+        return _hint_executor.submit(self.hints.hint, list(self.path), set(self.found_words))
+
+    def use_hint(self, search):
+        """
+        Use one hint attempt, if there's one, for a hint searched in the background
+        :param search: the done future returned by hint_in_background()
+        :return: the Move, with the path of the hint for a HINT result
+        """
+        refused = self.__refuse_hint()
+        if refused:
+            return refused
+        try:
+            path = search.result()
+        except TimeoutError:
+            return self.__move(HINT_PENDING)
+        return self.__use_hint(path)
+
+    def __refuse_hint(self):
+        """
+        :return: the Move if no hint can be given now, None otherwise
+        """
+        if not self.started:
+            return self.__move(NOT_STARTED)
+        if self.is_over:
+            return self.__move(GAME_OVER)
+        if self.hint_attempts == 0:
+            return self.__move(NO_HINTS_LEFT)
+        return None
+
+    def __use_hint(self, path):
+        if not path:
+            return self.__move(NO_MATCH)
+        self.hint_attempts -= 1
+        return self.__move(HINT, path, ''.join(self.board[i][j] for i, j in path))
+
+    def cancel(self):
+        """
+        Cancel the solving of the board if it didn't start yet, when the session is dropped
+        """
+        self.solution_index.cancel()
@@ -0,0 +1,75 @@
+"""
+Fixtures shared by the test modules, run the tests with `python3 -m pytest`.
+"""
+import os
+import random
+
+import pytest
+
+import boggle_board_randomizer as randomizer
+import boggle_lexicon as lexicons
+
+DICT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'boggle_dict.txt')
+
+
+@pytest.fixture(scope='session')
+def dict_words():
+    with open(DICT_PATH) as word_file:
+        return [line.strip() for line in word_file if line.strip()]
+
+
+@pytest.fixture(scope='session')
+def dict_lexicon(dict_words):
+    return lexicons.Lexicon(dict_words)
+
+
+@pytest.fixture(scope='session')
+def boards():
+    """
+    Random boards of every size, a QU cell forced on half of them
+    """
+    generator = random.Random(12)
+    boards = []
+    for size in sorted(randomizer.DICE_SETS):
+        for k in range(4):
+            board = [list(row) for row in randomizer.randomize_board(randomizer.DICE_SETS[size], generator)]
+            if k % 2:
+                board[generator.randrange(size)][generator.randrange(size)] = 'QU'
+            boards.append(board)
+    return boards
+
+
+def brute_force(board, word_set, prefixes):
+    """
+    Reference solver: every simple path of the board, pruned by a set of the prefixes of the words
+    :param word_set: set of the words
+    :param prefixes: set of the proper prefixes of the words
+    :return: dict mapping each word to the set of its paths
+    """
+    size = len(board)
+    neighbors = {(row, col): [(i, j) for i in range(row - 1, row + 2) for j in range(col - 1, col + 2)
+                              if 0 <= i < size and 0 <= j < size and (i, j) != (row, col)]
+                 for row in range(size) for col in range(size)}
+    found = dict()
+
+    def extend(path, word):
+        if word in word_set:
+            found.setdefault(word, set()).add(tuple(path))
+        if word in prefixes:
+            for cell in neighbors[path[-1]]:
+                if cell not in path:
+                    extend(path + [cell], word + board[cell[0]][cell[1]])
+
+    for cell in neighbors:
+        extend([cell], board[cell[0]][cell[1]])
+    return found
+
+
+@pytest.fixture(scope='session')
+def references(boards, dict_words):
+    """
+    The brute force solutions of the boards
+    """
+    word_set = set(dict_words)
+    prefixes = {word[:i] for word in word_set for i in range(1, len(word))}
+    return [brute_force(board, word_set, prefixes) for board in boards]
@@ -1,3 +1,11 @@
+import time
+
+import boggle_profile as profile
+from boggle_lexicon import BaseLexicon, Lexicon
+
+DEADLINE_CHECK_STEPS = 256  # steps of a search between checks of its deadline
+
+
 def __is_coord_valid(coord, board):
     """
     :param coord:
@@ -26,59 +34,350 @@ def is_valid_path(board, path, words):
         return word
 
 
-def __initials_set(words):
+class PathState:
     """
-    :param words: list of words
-    :return: set of sub-sets of each word in words from word[0] to
-    word[len(word) + 1]
+    A path being built on a board one cell at a time. It keeps the lexicon
+    node reached by the letters of the path, the visited cells as a bitmask
+    and the word, so adding or removing a cell and every query cost O(1)
+    whatever the length of the path.
     """
-    return set(word[:i] for word in words for i in range(len(word) + 1))
 
+    def __init__(self, board, lexicon):
+        """
+        :param board: 2 dimensional list of the board letters
+        :param lexicon: a lexicon from boggle_lexicon
+        """
+        self.__board = board
+        self.__lexicon = lexicon
+        self.path = []
+        # bit (row * size + col) is set for each cell in the path
+        self.visited = 0
+        # the lexicon node and the word after each step, None once the
+        # letters of the path don't start any word
+        self.__nodes = [lexicon.root]
+        self.__words = ['']
+
+    def __bit(self, coordinate):
+        return 1 << (coordinate[0] * len(self.__board) + coordinate[1])
+
+    def push(self, coordinate):
+        """
+        Add a cell at the end of the path, the caller checks it's a free
+        neighbor of the last cell
+        """
+        letters = self.__board[coordinate[0]][coordinate[1]]
+        node = self.__nodes[-1]
+        if node is not None:
+            node = self.__lexicon.walk(node, letters)
+        self.path.append(coordinate)
+        self.visited |= self.__bit(coordinate)
+        self.__nodes.append(node)
+        self.__words.append(self.__words[-1] + letters)
+
+    def pop(self):
+        """
+        Remove the last cell of the path
+        :return: its coordinate
+        """
+        coordinate = self.path.pop()
+        self.visited &= ~self.__bit(coordinate)
+        self.__nodes.pop()
+        self.__words.pop()
+        return coordinate
+
+    def clear(self):
+        del self.path[:]
+        self.visited = 0
+        del self.__nodes[1:]
+        del self.__words[1:]
+
+    def __contains__(self, coordinate):
+        return bool(self.visited & self.__bit(coordinate))
+
+    def __len__(self):
+        return len(self.path)
+
+    @property
+    def word(self):
+        return self.__words[-1]
+
+    @property
+    def is_word(self):
+        """
+        :return: True if the letters of the path are a word
+        """
+        node = self.__nodes[-1]
+        return node is not None and self.__lexicon.is_word(node)
+
+    @property
+    def is_prefix(self):
+        """
+        :return: True if some word starts with the letters of the path
+        """
+        return self.__nodes[-1] is not None
+
+    @property
+    def dead_end(self):
+        """
+        :return: True if no word starts with the letters of the path, so
+        adding cells can't make one
+        """
+        return self.__nodes[-1] is None
+
+
+def __as_lexicon(words, board):
+    """
+    :param words: a Lexicon, or any iterable of words
+    :param board: the board the lexicon will be used on
+    :return: the given Lexicon, or a new Lexicon built from the words which
+    only use letters that appear on the board
+    """
+    if isinstance(words, BaseLexicon):
+        return words
+    board_letters = set(''.join(cell for row in board for cell in row))
+    return Lexicon(word for word in words if board_letters.issuperset(word))
 
-def __find_length_n_helper(n, board, word_set, cur_coord, char_ind,
-                           char_lst, coord_ind, coord_lst,
-                           path_lst, compare_f, initials):
-    if not __is_coord_valid(cur_coord, board) or not \
-            board[cur_coord[0]][cur_coord[1]]:
-        return
 
-    cur_coord_str = board[cur_coord[0]][cur_coord[1]]
-    for i in range(len(cur_coord_str)):
-        char_lst[char_ind + i] = cur_coord_str[i]
+# board size -> (coordinates of each cell index, neighbor cell indices of
+# each cell index), cells are indexed row by row
+__neighbor_tables = dict()
 
-    word = ''.join(
-        char_lst[i] for i in range(char_ind + len(cur_coord_str)))
 
-    if word not in initials:
+def __neighbor_table(size):
+    """
+    :param size: length of the board side
+    :return: (list of the coordinate of each cell index, list of the neighbor
+    cell indices of each cell index)
+    """
+    if size not in __neighbor_tables:
+        coords = [(i, j) for i in range(size) for j in range(size)]
+        neighbors = [[k for k, (i, j) in enumerate(coords)
+                      if (i, j) != (row, col) and
+                      abs(i - row) <= 1 and abs(j - col) <= 1]
+                     for row, col in coords]
+        __neighbor_tables[size] = coords, neighbors
+    return __neighbor_tables[size]
+
+
+def __solve_board_helper(cells, coords, neighbors, lexicon, node, solutions,
+                         cell, visited, word, path):
+    cur_cell_str = cells[cell]
+    if not cur_cell_str:
         return
+    node = lexicon.walk(node, cur_cell_str)
 
-    coord_lst[coord_ind] = cur_coord
+    # no word starts with the letters of the path so far
+    if node is None:
+        return
 
-    # compare_f returns 1 if the relevant index > n, 0 if index == n else -1
-    compare_f_res = compare_f(coord_ind + 1, char_ind + len(cur_coord_str), n)
+    path.append(coords[cell])
+    word += cur_cell_str
+    visited |= 1 << cell  # bit k of visited is set if cell k is in the path
+
+    if lexicon.is_word(node):
+        solutions.setdefault(word, []).append(path[:])
+
+    for neighbor in neighbors[cell]:
+        if not visited >> neighbor & 1:
+            __solve_board_helper(cells, coords, neighbors, lexicon, node,
+                                 solutions, neighbor, visited, word, path)
+    path.pop()
 
-    if compare_f_res >= 0:
-        if compare_f_res == 1:
-            return
-        word = ''.join(
-            char_lst[i] for i in range(char_ind + len(cur_coord_str)))
-        if word in word_set:
-            path_lst.append(coord_lst[:coord_ind + 1])
-        return
 
-    board[cur_coord[0]][cur_coord[1]] = None  # if we visited this coord
+class __CountingLexicon(BaseLexicon):
+    """
+    Lexicon counting its walks, one per cell visited by the solver, used
+    while profiling
+    """
+
+    def __init__(self, lexicon):
+        self.root = lexicon.root
+        self.walks = 0
+        self.__lexicon = lexicon
+
+    def child(self, node, char):
+        return self.__lexicon.child(node, char)
+
+    def walk(self, node, string):
+        self.walks += 1
+        return self.__lexicon.walk(node, string)
+
+    def is_word(self, node):
+        return self.__lexicon.is_word(node)
+
+    def edges(self, node):
+        return self.__lexicon.edges(node)
 
-    for i in range(-1, 2):
-        for j in range(-1, 2):
-            if i == 0 and j == 0:
+
+@profile.timed('solve_board')
+def solve_board(board, words):
+    """
+    Find every word on the board, with all of its paths, in a single
+    traversal of the board. The board isn't modified, so it may be shared
+    between threads.
+    :param board: 2 dimensional list of the board letters
+    :param words: a Lexicon, or any iterable of words
+    :return: dict mapping each word found to the list of its paths, in the
+    order they were found
+    """
+    solutions = dict()
+    cells = [cell for row in board for cell in row]
+    coords, neighbors = __neighbor_table(len(board))
+    lexicon = __as_lexicon(words, board)
+    counting = profile.enabled
+    if counting:
+        lexicon = __CountingLexicon(lexicon)
+
+    for cell in range(len(cells)):
+        __solve_board_helper(cells, coords, neighbors, lexicon, lexicon.root,
+                             solutions, cell, 0, '', [])
+    if counting:
+        profile.count('solve_board.nodes', lexicon.walks)
+        profile.count('solve_board.words', len(solutions))
+    return solutions
+
+
+def __iter_board(board, words, start, exclude, path_length, word_length,
+                 deadline):
+    """
+    Depth first search yielding the words as they are found, in the order of
+    solve_board
+    :return: iterator of (word, path)
+    :raise TimeoutError: if the search is still running at the deadline
+    """
+    cells = [cell for row in board for cell in row]
+    coords, neighbors = __neighbor_table(len(board))
+    lexicon = __as_lexicon(words, board)
+
+    # walk the lexicon along the starting path
+    node, visited, word, path = lexicon.root, 0, '', []
+    for coordinate in start:
+        cell = coordinate[0] * len(board) + coordinate[1]
+        if not __is_coord_valid(coordinate, board) or visited >> cell & 1 or \
+                path and cell not in neighbors[coords.index(path[-1])]:
+            return
+        node = lexicon.walk(node, cells[cell]) if cells[cell] else None
+        if node is None:
+            return
+        visited |= 1 << cell
+        word += cells[cell]
+        path.append(coords[cell])
+    next_cells = neighbors[coords.index(path[-1])] if path else \
+        range(len(cells))
+
+    # each frame: (iterator of the cells to try next, node, visited cells,
+    # word) of a path, the first frame is of the starting path
+    stack = [(iter(next_cells), node, visited, word)]
+    steps = 0
+    while stack:
+        steps += 1
+        if deadline is not None and not steps % DEADLINE_CHECK_STEPS and \
+                time.perf_counter() > deadline:
+            raise TimeoutError('search of the board past its deadline')
+        next_cells, node, visited, word = stack[-1]
+        for cell in next_cells:
+            if visited >> cell & 1 or not cells[cell]:
                 continue
+            child = lexicon.walk(node, cells[cell])
+            if child is None:
+                continue
+            child_word = word + cells[cell]
+            path.append(coords[cell])
+            if lexicon.is_word(child) and child_word not in exclude and \
+                    path_length in (None, len(path)) and \
+                    word_length in (None, len(child_word)):
+                yield child_word, path[:]
+            # the path and the word only get longer
+            if (path_length is None or len(path) < path_length) and \
+                    (word_length is None or len(child_word) < word_length):
+                stack.append((iter(neighbors[cell]), child,
+                              visited | 1 << cell, child_word))
             else:
-                __find_length_n_helper(
-                    n, board, word_set, (cur_coord[0] + i, cur_coord[1] + j),
-                    char_ind + len(cur_coord_str), char_lst, coord_ind + 1,
-                    coord_lst, path_lst, compare_f, initials)
+                path.pop()
+            break
+        else:
+            stack.pop()
+            if stack:
+                path.pop()
+
+
+def iter_words(board, words, length=None, start=(), exclude=(),
+               deadline=None):
+    """
+    Generator of the words of the board, yielded as the search finds them
+    (the order of solve_board), once per path; stopping early stops the
+    search
+    :param board: 2 dimensional list of the board letters
+    :param words: a Lexicon, or any iterable of words
+    :param length: only the words of this length
+    :param start: only the paths continuing this path (list of coordinates)
+    :param exclude: words to skip, e.g. the words found
+    :param deadline: time.perf_counter() time after which the search raises
+    TimeoutError, None for no limit
+    :return: iterator of (word, path)
+    """
+    return __iter_board(board, words, start, exclude, None, length, deadline)
+
+
+def iter_paths(board, words, length=None, start=(), exclude=(),
+               deadline=None):
+    """
+    Generator of the paths of the words of the board, like iter_words
+    :param length: only the paths of this length
+    :return: iterator of paths
+    """
+    for word, path in __iter_board(board, words, start, exclude, length,
+                                   None, deadline):
+        yield path
 
-    board[cur_coord[0]][cur_coord[1]] = cur_coord_str
+
+class SolutionIndex:
+    """
+    Every word of a board with its paths, indexed by path prefix so that the
+    words continuing a given path are found with a single lookup.
+    """
+
+    @profile.timed('solution_index')
+    def __init__(self, board, words):
+        """
+        Solve the board and build the index
+        :param board: 2 dimensional list of the board letters
+        :param words: a Lexicon, or any iterable of words
+        """
+        self.words = solve_board(board, words)
+        # the highest total score, each word scored by its longest path
+        self.max_score = sum(len(max(paths, key=len)) ** 2
+                             for paths in self.words.values())
+        # path prefix -> [(word, path)...] of the paths strictly longer than
+        # the prefix which start with it, shortest paths first
+        self.__completions = dict()
+        for word, paths in self.words.items():
+            for path in paths:
+                for i in range(len(path)):
+                    self.__completions.setdefault(tuple(path[:i]), []).append(
+                        (word, path))
+        for completions in self.__completions.values():
+            completions.sort(key=lambda completion: len(completion[1]))
+
+    def completions(self, path):
+        """
+        :param path: list of coordinates
+        :return: list of (word, path) of the paths continuing the given path,
+        shortest first
+        """
+        return self.__completions.get(tuple(path), [])
+
+    def hint(self, path, found_words=()):
+        """
+        :param path: list of coordinates
+        :param found_words: words to skip
+        :return: the shortest path continuing the given path whose word isn't
+        in found_words, None if there's none
+        """
+        for word, completion in self.completions(path):
+            if word not in found_words:
+                return completion
+        return None
 
 
 def find_length_n_paths(n, board, words):
@@ -86,19 +385,8 @@ def find_length_n_paths(n, board, words):
     if n > len(board) ** 2:
         return []
 
-    path_lst = []
-    char_lst = [None for _ in range(n + 2)]
-    coord_lst = [None for _ in range(n + 1)]
-    initials = __initials_set(words)
-
-    for i in range(len(board)):
-        for j in range(len(board)):
-            __find_length_n_helper(n, board, words, (i, j), 0,
-                                   char_lst, 0, coord_lst, path_lst,
-                                   lambda path_len, word_len, n: 1 if
-                                   path_len > n else (
-                                       0 if path_len == n else -1), initials)
-    return path_lst
+    return [path for paths in solve_board(board, words).values()
+            for path in paths if len(path) == n]
 
 
 def find_length_n_words(n, board, words):
@@ -106,76 +394,27 @@ def find_length_n_words(n, board, words):
     if n > 2 * len(board) ** 2:
         return []
 
-    path_lst = []
-    char_lst = [None for _ in range(n + 2)]
-    coord_lst = [None for _ in range(n + 1)]
-    word_set = set(words)
-    initials = __initials_set(words)
-
-    for i in range(len(board)):
-        for j in range(len(board)):
-            __find_length_n_helper(n, board, word_set, (i, j), 0,
-                                   char_lst, 0, coord_lst, path_lst,
-                                   lambda path_len, word_len, n: 1 if
-                                   word_len > n else (
-                                       0 if word_len == n else -1), initials)
-    return path_lst
-
-
-def __max_score_paths_helper(board, words_dict, cur_coord,
-                             char_ind, char_lst, coord_ind, coord_lst,
-                             initials):
-    if not __is_coord_valid(cur_coord, board) or not \
-            board[cur_coord[0]][cur_coord[1]]:
-        return
-
-    cur_coord_str = board[cur_coord[0]][cur_coord[1]]
-    for i in range(len(cur_coord_str)):
-        char_lst[char_ind + i] = cur_coord_str[i]
-
-    coord_lst[coord_ind] = cur_coord
-    word = ''.join(char_lst[i] for i in range(char_ind + len(cur_coord_str)))
-
-    if word not in initials:
-        return
-
-    if word in words_dict:
-        if not words_dict[word] or len(words_dict[word]) < coord_ind + 1:
-            words_dict[word] = coord_lst[:coord_ind + 1]
-
-    board[cur_coord[0]][cur_coord[1]] = None  # if we visited this coord
-    # all the (dy, dx) of 8 directions
-    for i in range(-1, 2):
-        for j in range(-1, 2):
-            if i == 0 and j == 0:
-                continue
-            __max_score_paths_helper(board, words_dict,
-                                     (cur_coord[0] + i, cur_coord[1] + j),
-                                     char_ind + len(cur_coord_str),
-                                     char_lst, coord_ind + 1,
-                                     coord_lst, initials)
-    board[cur_coord[0]][cur_coord[1]] = cur_coord_str
+    return [path for word, paths in solve_board(board, words).items()
+            if len(word) == n for path in paths]
 
 
 def max_score_paths(board, words):
-    words_dict = {word: None for word in words}
-
-    # len of word can be up to len(board)**2*2
-    char_lst = [None for _ in range(len(board) ** 2 * 2)]
-
-    # len of path can be up to len(board)**2
-    coord_lst = [None for _ in range(len(board) ** 2)]
+    # the longest path of each word, the first one found if there are several
+    return [max(paths, key=len)
+            for paths in solve_board(board, words).values()]
 
-    initials = __initials_set(words)
 
-    for i in range(len(board)):
-        for j in range(len(board)):
-            __max_score_paths_helper(board, words_dict, (i, j),
-                                     0, char_lst, 0, coord_lst, initials)
-
-    return list(words_dict[word] for word in words_dict if words_dict[word])
+def max_score(board, words):
+    """
+    :param board: 2 dimensional list of the board letters
+    :param words: a Lexicon, or any iterable of words
+    :return: the highest total score of the board, every word scoring the
+    length of its longest path to the power of 2
+    """
+    return sum(len(path) ** 2 for path in max_score_paths(board, words))
 
 
+@profile.timed('load_words_from_file')
 def load_words_from_file(file_path):
     """
     :param file_path: path of file with words
@@ -0,0 +1,43 @@
+import os
+import shutil
+
+import pytest
+
+import boggle_assets as assets
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), assets.IMAGES_DIR)
+
+
+@pytest.fixture
+def images(tmp_path, monkeypatch):
+    # the images are read relative to the working directory
+    shutil.copytree(IMAGES_DIR, str(tmp_path / assets.IMAGES_DIR),
+                    ignore=shutil.ignore_patterns(os.path.basename(assets.PACK_PATH)))
+    monkeypatch.chdir(tmp_path)
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(assets.IMAGES_DIR))
+
+
+def test_build_pack_round_trip(images):
+    assert assets.build_pack() == len(images)
+    pack = assets.AssetPack(assets.PACK_PATH)
+    for name in images:
+        with open(assets.image_path(name), 'rb') as image_file:
+            assert pack.data(name) == image_file.read()
+    assert pack.data('missing') is None
+
+
+def test_pack_skips_changed_images(images):
+    assets.build_pack()
+    changed = assets.image_path(images[0])
+    stat = os.stat(changed)
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    pack = assets.AssetPack(assets.PACK_PATH)
+    assert pack.data(images[0]) is None
+    assert pack.data(images[1]) is not None
+
+
+def test_pack_needs_its_magic(tmp_path):
+    not_a_pack = tmp_path / 'assets.pack'
+    not_a_pack.write_bytes(b'\x89PNG\r\n\x1a\n' + bytes(32))
+    with pytest.raises(ValueError):
+        assets.AssetPack(str(not_a_pack))
@@ -0,0 +1,36 @@
+import pytest
+
+import boggle_board_randomizer as randomizer
+import ex12_utils as utils
+
+# boggle_batch needs NumPy, an optional dependency
+np = pytest.importorskip('numpy')
+import boggle_batch as batch  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def batch_lexicon(dict_lexicon):
+    return batch.BatchLexicon(dict_lexicon)
+
+
+def test_encode_boards(boards):
+    sized = [board for board in boards if len(board) == 4]
+    encoded = batch.encode_boards(sized)
+    assert encoded.shape == (len(sized), 4, 4) and encoded.dtype == np.uint8
+    assert [randomizer.decode_board(codes) for codes in encoded.tolist()] == sized
+
+
+def test_score_boards(boards, dict_lexicon, batch_lexicon):
+    for size in sorted(randomizer.DICE_SETS):
+        sized = [board for board in boards if len(board) == size]
+        counts, scores = batch.score_boards(batch.encode_boards(sized), batch_lexicon)
+        assert counts.dtype == scores.dtype == np.int64
+        assert list(counts) == [len(utils.solve_board(board, dict_lexicon)) for board in sized]
+        assert list(scores) == [utils.max_score(board, dict_lexicon) for board in sized]
+
+
+def test_score_boards_in_chunks(boards, batch_lexicon):
+    sized = batch.encode_boards([board for board in boards if len(board) == 5])
+    whole = batch.score_boards(sized, batch_lexicon)
+    chunked = batch.score_boards(sized, batch_lexicon, chunk_size=1)
+    assert [list(array) for array in whole] == [list(array) for array in chunked]
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+import boggle_gui as gui
+
+
+@pytest.mark.parametrize('count', [0, 1, gui.ROWS_CHUNK, 5 * gui.ROWS_CHUNK + 3])
+def test_sorted_rows(count):
+    generator = random.Random(count)
+    initial = [generator.random() for _ in range(count)]
+    rows = gui.SortedRows(initial)
+    expected = sorted(initial)
+    # many more rows than a chunk, so that the chunks are split
+    for _ in range(3 * gui.ROWS_CHUNK):
+        row = generator.choice([generator.random(), generator.choice(expected or [0.5])])
+        index = rows.add(row)
+        expected.insert(index, row)
+        assert expected[index] == row and expected == sorted(expected)
+    assert len(rows) == len(expected)
+    assert [rows[i] for i in range(len(rows))] == expected
+    for index in (-1, len(rows)):
+        with pytest.raises(IndexError):
+            rows[index]
+
+
+def test_sorted_rows_in_order():
+    rows = gui.SortedRows()
+    for row in range(2 * gui.ROWS_CHUNK):
+        assert rows.add(row) == row
+    for row in range(-1, -2 * gui.ROWS_CHUNK, -1):
+        assert rows.add(row) == 0
+    assert [rows[i] for i in range(len(rows))] == list(range(-2 * gui.ROWS_CHUNK + 1, 2 * gui.ROWS_CHUNK))
+
+
+FOUND = [('TOE', 1), ('QUIET', 4), ('CATS', 2), ('ART', 1), ('SEAT', 2)]
+
+
+def rows_of(words):
+    return [words.row(i) for i in range(len(words))]
+
+
+def test_word_list_orders():
+    words = gui.WordList()
+    assert [words.add(word, score) for word, score in FOUND] == [0, 1, 2, 3, 4]
+    assert rows_of(words) == [(word, False) for word, score in FOUND]
+    words.set_order(gui.ALPHABETICAL_ORDER)
+    assert [text for text, header in rows_of(words)] == ['ART', 'CATS', 'QUIET', 'SEAT', 'TOE']
+    words.set_order(gui.LENGTH_ORDER)
+    assert rows_of(words) == [('5 LETTERS', True), ('QUIET', False),
+                              ('4 LETTERS', True), ('CATS', False), ('SEAT', False),
+                              ('3 LETTERS', True), ('ART', False), ('TOE', False)]
+    words.set_order(gui.SCORE_ORDER)
+    assert rows_of(words) == [('+4', True), ('QUIET', False),
+                              ('+2', True), ('CATS', False), ('SEAT', False),
+                              ('+1', True), ('ART', False), ('TOE', False)]
+    assert words.words_count == len(FOUND)
+
+
+def test_word_list_adds_in_order():
+    # adding the words one by one gives the rows of a rebuild
+    for order in gui.WORD_ORDERS:
+        words = gui.WordList(order)
+        for word, score in FOUND:
+            index = words.add(word, score)
+            assert words.row(index) == (word, False)
+        rows = rows_of(words)
+        words.set_order(order)
+        assert rows_of(words) == rows
+
+
+def test_word_list_filter():
+    words = gui.WordList(gui.LENGTH_ORDER, 'e')
+    assert [words.add(word, score) for word, score in FOUND] == [1, 1, None, None, 3]
+    assert rows_of(words) == [('5 LETTERS', True), ('QUIET', False), ('4 LETTERS', True), ('SEAT', False),
+                              ('3 LETTERS', True), ('TOE', False)]
+    words.set_filter('AT')
+    assert rows_of(words) == [('4 LETTERS', True), ('CATS', False), ('SEAT', False)]
+    words.set_filter('')
+    assert len(words) == len(FOUND) + 3 and words.words_count == len(FOUND)
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+import boggle_board_randomizer as randomizer
+import boggle_lexicon as lexicons
+import boggle_profile as profile
+import ex12_utils as utils
+
+TILES = {face for die in randomizer.LETTERS for face in die}
+
+
+def test_compiled_lexicon_round_trip(dict_words, dict_lexicon, tmp_path):
+    packed_path = str(tmp_path / 'words.dawg')
+    lexicons.compile_lexicon(dict_lexicon, packed_path)
+    packed = lexicons.PackedLexicon(packed_path)
+    assert len(packed) == len(dict_lexicon) == len(set(dict_words))
+    for word in random.Random(3).sample(dict_words, 2000):
+        assert word in packed and packed.has_prefix(word[:2])
+        assert (word + 'Q' in packed) == (word + 'Q' in dict_lexicon)
+    for word in ('', 'QX', 'ZZZZZZ', 'CATX'):
+        assert (word in packed) == (word in dict_lexicon)
+    assert list(packed) == list(dict_lexicon)
+
+    # a compiled lexicon compiles to the same file
+    again_path = str(tmp_path / 'again.dawg')
+    lexicons.compile_lexicon(packed, again_path)
+    with open(packed_path, 'rb') as packed_file, open(again_path, 'rb') as again_file:
+        assert packed_file.read() == again_file.read()
+
+
+def test_load_lexicon_uses_the_compiled_dictionary(tmp_path):
+    words_path = tmp_path / 'words.txt'
+    words_path.write_text('CAT\nCATS\nDOG\n')
+    assert isinstance(lexicons.load_lexicon(str(words_path)), lexicons.Lexicon)
+    lexicons.compile_lexicon(lexicons.Lexicon(['CAT', 'CATS', 'DOG']), lexicons.compiled_path(str(words_path)))
+    loaded = lexicons.load_lexicon(str(words_path))
+    assert isinstance(loaded, lexicons.PackedLexicon) and sorted(loaded) == ['CAT', 'CATS', 'DOG']
+
+
+def test_tokenize():
+    assert lexicons.tokenize('QUIET', TILES) == ['QU', 'I', 'E', 'T']
+    assert lexicons.tokenize('AQUA', TILES) == ['A', 'QU', 'A']
+    assert lexicons.tokenize('CAT', TILES) == ['C', 'A', 'T']
+    assert lexicons.tokenize('', TILES) == []
+    # a Q must be followed by a U
+    assert lexicons.tokenize('QATAR', TILES) is None
+    assert lexicons.tokenize('IRAQ', TILES) is None
+    assert lexicons.tokenize('CAT', {'C', 'A'}) is None
+
+
+def test_preprocess_words():
+    lines = ['cat\n', '  Quiet \n', '\n', 'it\n', 'qatar\n', "don't\n", 'café\n',
+             'ABCDEFGHIJKLMNOPR\n', 'QUEUES\n']
+    rejected = dict()
+    words = lexicons.preprocess_words(lines, TILES, max_tiles=16, rejected=rejected)
+    assert list(words) == ['CAT', 'QUIET', 'QUEUES']
+    # an accented letter is a letter, but not on the dice
+    assert rejected == {'short': 1, 'tiles': 2, 'characters': 1, 'long': 1}
+    # one line at a time
+    words = lexicons.preprocess_words(iter(['dog', 'x' * 3]), TILES, min_length=4)
+    assert list(words) == []
+
+
+def test_preprocess_words_counts_the_tiles():
+    # QU is one tile: 16 tiles but 17 letters
+    word = 'QU' + 'A' * 15
+    assert list(lexicons.preprocess_words([word], TILES, max_tiles=16)) == [word]
+    assert list(lexicons.preprocess_words([word + 'A'], TILES, max_tiles=16)) == []
+
+
+def test_base_lexicon_is_abstract():
+    class NoEdges(lexicons.BaseLexicon):
+        def child(self, node, char):
+            return None
+
+        def is_word(self, node):
+            return False
+
+    with pytest.raises(TypeError):
+        lexicons.BaseLexicon()
+    with pytest.raises(TypeError):
+        NoEdges()
+
+
+def test_profiled_solve_board_counts_the_walks(dict_lexicon, monkeypatch):
+    # the solver wraps the lexicon in a lexicon of its own while profiling
+    monkeypatch.setattr(profile, 'enabled', True)
+    monkeypatch.setattr(profile, '_counters', dict())
+    monkeypatch.setattr(profile, '_histograms', dict())
+    board = [['C', 'A', 'T', 'S'], ['O', 'X', 'X', 'E'], ['D', 'X', 'X', 'A'], ['E', 'X', 'QU', 'T']]
+    solutions = utils.solve_board(board, dict_lexicon)
+    assert 'CAT' in solutions
+    assert profile._counters['solve_board.words'] == len(solutions)
+    assert profile._counters['solve_board.nodes'] > 0
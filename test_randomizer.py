@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+import boggle_board_randomizer as randomizer
+
+
+def test_encode_board_round_trip(boards):
+    for board in boards:
+        codes = randomizer.encode_board(board)
+        assert all(0 <= code < len(randomizer.TILES) for row in codes for code in row)
+        assert randomizer.decode_board(codes) == board
+
+
+@pytest.mark.parametrize('size', sorted(randomizer.DICE_SETS))
+def test_board_generator(size):
+    dice = randomizer.DICE_SETS[size]
+    generator = randomizer.BoardGenerator(7, dice)
+    assert generator.size == size
+    packed = generator.generate_many(50)
+    assert len(packed) == 50 * size * size
+    # the same seed gives the same boards
+    assert randomizer.BoardGenerator(7, dice).generate_many(50) == packed
+    assert randomizer.BoardGenerator(8, dice).generate_many(50) != packed
+    faces = {face for die in dice for face in die}
+    for index in range(50):
+        board = randomizer.unpack_board(packed, size, index)
+        assert len(board) == size and all(len(row) == size for row in board)
+        assert all(tile in faces for row in board for tile in row)
+        assert randomizer.encode_board(board) == \
+            [list(packed[start:start + size])
+             for start in range(index * size * size, (index + 1) * size * size, size)]
+
+
+def test_board_generator_generate():
+    generator = randomizer.BoardGenerator('seed')
+    boards = [generator.generate() for _ in range(3)]
+    packed = randomizer.BoardGenerator('seed').generate_many(3)
+    assert boards == [randomizer.unpack_board(packed, index=index) for index in range(3)]
+
+
+def test_board_generator_needs_a_square():
+    with pytest.raises(ValueError):
+        randomizer.BoardGenerator(0, randomizer.LETTERS[:15])
+
+
+def test_randomize_board_uses_every_die_once():
+    board = randomizer.randomize_board(randomizer.LETTERS, random.Random(3))
+    dice = [set(die) for die in randomizer.LETTERS]
+    # each tile comes from a different die: a perfect matching of the cells to the dice exists
+    matched = dict()
+
+    def match(cell, seen):
+        for die, faces in enumerate(dice):
+            if board[cell // 4][cell % 4] in faces and die not in seen:
+                seen.add(die)
+                if die not in matched or match(matched[die], seen):
+                    matched[die] = cell
+                    return True
+        return False
+
+    assert all(match(cell, set()) for cell in range(16))
@@ -0,0 +1,143 @@
+from concurrent.futures import Future
+
+import pytest
+
+import boggle_lexicon as lexicons
+import boggle_session as session
+
+BOARD = [['C', 'A', 'T', 'S'],
+         ['O', 'X', 'X', 'E'],
+         ['D', 'X', 'X', 'A'],
+         ['E', 'X', 'QU', 'T']]
+WORDS = ['CAT', 'CATS', 'ACT', 'COD', 'CODE', 'SEA', 'SEAT', 'EAT', 'QUAT', 'QUOTE', 'ZZZ']
+
+
+@pytest.fixture
+def lexicon():
+    return lexicons.Lexicon(WORDS)
+
+
+@pytest.fixture
+def game(lexicon):
+    game = session.GameSession(BOARD, lexicon)
+    game.solution_index.result()
+    return game
+
+
+def test_select_scores_a_word(game):
+    game.start()
+    for cell in [(0, 0), (0, 1)]:
+        assert game.select(cell).result == session.SELECTED
+    move = game.select((0, 2))
+    assert move == session.Move(session.WORD_FOUND, [(0, 0), (0, 1), (0, 2)], 'CAT', 9)
+    assert game.score == 9 and game.found_words == {'CAT'} and game.path == []
+
+
+def test_select_rules(game):
+    assert game.select((0, 0)).result == session.NOT_STARTED
+    game.start()
+    game.select((0, 0))
+    game.select((0, 1))
+    assert game.select((3, 3)).result == session.NOT_NEIGHBOR
+    assert game.select((0, 0)).result == session.NOT_LAST
+    assert game.select((0, 1)).result == session.DESELECTED
+    assert game.path == [(0, 0)]
+
+
+@pytest.mark.parametrize('cell', [(1, -1), (0, -1), (-1, 0), (4, 0), (0, 4), (0,), (0, 0, 0), ('0', '1'),
+                                  (True, 1), (0, False), (1.0, 1), 5, '01', {0: 0, 1: 1}, None])
+def test_select_rejects_invalid_cells(game, cell):
+    game.start()
+    move = game.select(cell)
+    assert move.result == session.INVALID_CELL
+    assert game.path == [] and move.path == []
+
+
+def test_select_accepts_a_list(game):
+    game.start()
+    assert game.select([0, 0]).result == session.SELECTED
+    assert game.select([0, 1]).path == [(0, 0), (0, 1)]
+    assert game.select([0, 1]).result == session.DESELECTED
+    assert game.path == [(0, 0)]
+
+
+def test_hint_needs_a_running_game(game):
+    assert game.hint().result == session.NOT_STARTED
+    assert game.use_hint(game.hint_in_background()).result == session.NOT_STARTED
+    game.start()
+    game.time_left = 1
+    game.tick()
+    assert game.is_over
+    assert game.hint().result == session.GAME_OVER
+    assert game.use_hint(game.hint_in_background()).result == session.GAME_OVER
+    assert game.hint_attempts == session.HINT_ATTEMPTS
+
+
+def test_hints(game):
+    game.start()
+    game.select((0, 0))
+    move = game.hint()
+    assert move.result == session.HINT and move.word in ('CAT', 'COD')
+    assert game.hint_attempts == session.HINT_ATTEMPTS - 1
+    # the next hint on the same path skips the found words
+    game.found_words.add(move.word)
+    assert game.use_hint(game.hint_in_background()).word in ({'CAT', 'COD'} - {move.word})
+    game.hint_attempts = 0
+    assert game.hint().result == session.NO_HINTS_LEFT
+
+
+def test_hint_without_match(game):
+    game.start()
+    game.select((1, 1))
+    assert game.hint().result == session.NO_MATCH
+    assert game.hint_attempts == session.HINT_ATTEMPTS
+
+
+def test_best_hint(lexicon):
+    game = session.GameSession(BOARD, lexicon, hint_mode=session.BEST)
+    game.start()
+    game.select((0, 0))
+    assert game.hint().word in ('CATS', 'CODE')
+
+
+def test_unknown_hint_mode_is_rejected_before_solving(lexicon, monkeypatch):
+    solved = []
+    monkeypatch.setattr(session, 'solve_in_background', lambda *args: solved.append(args))
+    with pytest.raises(ValueError):
+        session.GameSession(BOARD, lexicon, hint_mode='longest')
+    assert solved == []
+
+
+@pytest.mark.parametrize('mode', session.HINT_MODES)
+def test_hint_search_before_the_board_is_solved(lexicon, mode):
+    # the solution index never gets ready, the board is searched
+    searched = session.HintService(BOARD, lexicon, Future(), mode)
+    solved = session.HintService(BOARD, lexicon, session.solve_in_background(BOARD, lexicon), mode)
+    solved_hint = solved.hint([], set())  # waits for the solution index
+    assert len(searched.hint([], set())) == len(solved_hint)
+    for path, found_words in [([(0, 0)], set()), ([(0, 0)], {'CAT'}), ([(0, 0)], {'CAT', 'COD', 'CATS'}),
+                              ([(3, 2)], set()), ([(1, 1)], set()), ([(0, 0)], set(WORDS))]:
+        expected = solved.hint(path, found_words)
+        hint = searched.hint(path, found_words)
+        assert (hint is None) == (expected is None)
+        if hint is not None:
+            assert len(hint) == len(expected) and hint[:len(path)] == path
+
+
+def test_shortest_hint_search_by_length(lexicon):
+    # the search goes deep first, CATS is found before COD
+    searched = session.HintService(BOARD, lexicon, Future(), session.SHORTEST)
+    assert searched.hint([(0, 0)], {'CAT'}) == [(0, 0), (1, 0), (2, 0)]
+
+
+def test_hint_search_budget(boards, dict_lexicon):
+    board = max(boards, key=len)
+    searched = session.HintService(board, dict_lexicon, Future(), session.BEST, budget=0)
+    with pytest.raises(session.TimeoutError):
+        searched.hint([], set())
+    game = session.GameSession(board, dict_lexicon, Future())
+    game.hints = searched
+    game.start()
+    assert game.hint().result == session.HINT_PENDING
+    assert game.use_hint(game.hint_in_background()).result == session.HINT_PENDING
+    assert game.hint_attempts == session.HINT_ATTEMPTS
@@ -0,0 +1,117 @@
+import boggle_lexicon as lexicons
+import ex12_utils as utils
+
+BOARD = [['C', 'A', 'T', 'S'],
+         ['X', 'X', 'X', 'X'],
+         ['X', 'QU', 'I', 'T'],
+         ['X', 'X', 'X', 'X']]
+
+
+def test_path_state():
+    state = utils.PathState(BOARD, lexicons.Lexicon(['CAT', 'CATS', 'QUIT']))
+    assert state.word == '' and len(state) == 0 and state.is_prefix and not state.is_word
+    for cell in [(0, 0), (0, 1), (0, 2)]:
+        state.push(cell)
+    assert state.word == 'CAT' and state.is_word and state.is_prefix
+    assert state.path == [(0, 0), (0, 1), (0, 2)] and len(state) == 3
+    assert (0, 1) in state and (0, 3) not in state
+    state.push((0, 3))
+    assert state.word == 'CATS' and state.is_word
+    assert state.pop() == (0, 3)
+    assert (0, 3) not in state and state.word == 'CAT'
+    state.clear()
+    assert state.path == [] and state.visited == 0 and state.word == ''
+    for cell in [(2, 1), (2, 2), (2, 3)]:
+        state.push(cell)
+    assert state.word == 'QUIT' and state.is_word
+
+
+def test_path_state_dead_end():
+    state = utils.PathState(BOARD, lexicons.Lexicon(['CAT']))
+    state.push((0, 0))
+    state.push((1, 0))
+    assert state.word == 'CX' and state.dead_end and not state.is_prefix and not state.is_word
+    # the path goes on past a dead end, and comes back from it
+    state.push((1, 1))
+    assert state.word == 'CXX' and state.dead_end
+    state.pop()
+    state.pop()
+    assert state.word == 'C' and state.is_prefix and not state.dead_end
+
+
+def test_solve_board(boards, references, dict_lexicon, tmp_path):
+    # the QU cells are part of words
+    assert any('QU' in word for reference in references for word in reference)
+    packed_path = str(tmp_path / 'words.dawg')
+    lexicons.compile_lexicon(dict_lexicon, packed_path)
+    packed = lexicons.PackedLexicon(packed_path)
+    for board, reference in zip(boards, references):
+        for words in (dict_lexicon, packed):
+            solutions = utils.solve_board(board, words)
+            assert {word: set(map(tuple, paths)) for word, paths in solutions.items()} == reference
+
+
+def test_solve_board_with_a_word_list(boards, references):
+    words = ['CAT', 'QUIT', 'AQUA', 'ZZZ'] + [word for word in references[1]][:20]
+    solutions = utils.solve_board(boards[1], words)
+    assert set(solutions) == set(references[1]) & set(words)
+
+
+def test_find_length_n(boards, references, dict_lexicon):
+    for board, reference in zip(boards, references):
+        for n in range(1, 11):
+            paths = utils.find_length_n_paths(n, board, dict_lexicon)
+            assert sorted(map(tuple, paths)) == \
+                sorted(path for word_paths in reference.values() for path in word_paths if len(path) == n)
+            paths = utils.find_length_n_words(n, board, dict_lexicon)
+            assert sorted(map(tuple, paths)) == \
+                sorted(path for word, word_paths in reference.items() if len(word) == n for path in word_paths)
+
+
+def test_max_score_paths(boards, references, dict_lexicon):
+    for board, reference in zip(boards, references):
+        paths = utils.max_score_paths(board, dict_lexicon)
+        words = [utils.is_valid_path(board, path, dict_lexicon) for path in paths]
+        assert sorted(words) == sorted(reference)
+        for word, path in zip(words, paths):
+            assert tuple(path) in reference[word]
+            assert len(path) == max(map(len, reference[word]))
+        assert utils.max_score(board, dict_lexicon) == \
+            sum(max(map(len, word_paths)) ** 2 for word_paths in reference.values())
+
+
+def test_iter_words(boards, references, dict_lexicon):
+    board, reference = boards[0], references[0]
+    found = list(utils.iter_words(board, dict_lexicon))
+    assert sorted(found) == sorted((word, list(path)) for word, paths in reference.items() for path in paths)
+    # in the order of solve_board
+    grouped = dict()
+    for word, path in found:
+        grouped.setdefault(word, []).append(path)
+    assert list(grouped.items()) == list(utils.solve_board(board, dict_lexicon).items())
+    assert sorted(utils.iter_words(board, dict_lexicon, length=4)) == \
+        sorted((word, list(path)) for word, path in found if len(word) == 4)
+    exclude = {word for word, path in found[::2]}
+    assert sorted(utils.iter_words(board, dict_lexicon, exclude=exclude)) == \
+        sorted((word, path) for word, path in found if word not in exclude)
+
+
+def test_iter_paths_from_a_start(boards, references, dict_lexicon):
+    board, reference = boards[0], references[0]
+    start = max((path for paths in reference.values() for path in paths), key=len)[:2]
+    expected = sorted(list(path) for paths in reference.values() for path in paths
+                      if path[:2] == start and len(path) > 2)
+    assert expected
+    assert sorted(utils.iter_paths(board, dict_lexicon, start=start)) == expected
+    assert sorted(utils.iter_paths(board, dict_lexicon, length=3, start=start)) == \
+        [path for path in expected if len(path) == 3]
+
+
+def test_iter_paths_from_an_invalid_start(boards, dict_lexicon):
+    board = boards[0]
+    for start in [[(0, 0), (0, 0)], [(0, 0), (2, 2)], [(0, len(board))]]:
+        assert list(utils.iter_paths(board, dict_lexicon, start=start)) == []
+    # stopping early stops the search
+    words = utils.iter_words(board, dict_lexicon)
+    next(words)
+    words.close()